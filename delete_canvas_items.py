@@ -1,12 +1,32 @@
 import os
 import re
+import time
 import requests
-from typing import List, Dict, Tuple
+from typing import Dict, Iterator, List, Tuple
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from files.backend.canvas_session import next_page_url, parse_json
 
 load_dotenv()
 
+# Patterns to match: "Week #" (simple format), "Week #: Topic (Date)" (detailed format),
+# "HW##", "Checkout#", and "Quiz#"
+_WEEK_RE = re.compile(r"^Week\s+\d+.*$", re.IGNORECASE)
+_HW_RE = re.compile(r"^HW\d{2}$", re.IGNORECASE)
+_CHECKOUT_RE = re.compile(r"^Checkout\d+$", re.IGNORECASE)
+_QUIZ_RE = re.compile(r"^Quiz\s*\d+$", re.IGNORECASE)
+
+# Cheap lowercase prefix guards so most titles never reach the regex engine
+_PAGE_PREFIXES = ("week", "hw")
+_ASSIGNMENT_PREFIXES = ("checkout", "quiz", "hw")
+
+# Canvas caps per_page at 100; asking for the max keeps pagination round trips down
+PER_PAGE = 100
+
+# Canvas answers throttled requests with 403 "Rate Limit Exceeded" (or 429); retry those with backoff
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1.0
+
 
 class CanvasDeleter:
     def __init__(self, course_id: str, access_token: str):
@@ -15,74 +35,90 @@ class CanvasDeleter:
         self.headers = {"Authorization": f"Bearer {access_token}"}
         self.base_url = "https://umich.instructure.com/api/v1"
 
-    def get_all_pages(self) -> List[Dict]:
-        pages = []
-        url = f"{self.base_url}/courses/{self.course_id}/pages"
+        # Reuse one connection pool for every request so keep-alive amortizes the TLS handshake
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
 
-        while url:
-            try:
-                response = requests.get(url, headers=self.headers)
-                response.raise_for_status()
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.session.close()
 
-                page_data = response.json()
-                pages.extend(page_data)
+    def __enter__(self):
+        return self
 
-                # Check for pagination
-                links = response.headers.get("Link", "")
-                url = None
-                for link in links.split(","):
-                    if 'rel="next"' in link:
-                        url = link.split(";")[0].strip("<>")
-                        break
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching pages: {e}")
-                break
+    def _delete_with_backoff(self, url: str) -> requests.Response:
+        """
+        Send a DELETE request, backing off and retrying while Canvas reports throttling.
 
-        return pages
+        Args:
+            url: Full Canvas API URL of the item to delete
 
-    def get_all_assignments(self) -> List[Dict]:
+        Returns:
+            The final response from Canvas
         """
-        Retrieve all assignments from the Canvas course.
+        for attempt in range(MAX_RETRIES + 1):
+            response = self.session.delete(url)
+            throttled = response.status_code == 429 or (
+                response.status_code == 403 and "Rate Limit Exceeded" in response.text
+            )
+            if not throttled or attempt == MAX_RETRIES:
+                return response
+            time.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+        return response
 
-        Returns:
-            List of assignment dictionaries from Canvas API
+    def _paginate(self, path: str) -> Iterator[Dict]:
         """
-        assignments = []
-        url = f"{self.base_url}/courses/{self.course_id}/assignments"
+        Walk every page of a Canvas course collection, following the Link headers.
+
+        Args:
+            path: Collection path under the course, e.g. "pages" or "assignments"
+
+        Yields:
+            Each item dictionary returned by the Canvas API
+        """
+        url = f"{self.base_url}/courses/{self.course_id}/{path}"
+        params = {"per_page": PER_PAGE}
 
         while url:
             try:
-                response = requests.get(url, headers=self.headers)
+                response = self.session.get(url, params=params)
                 response.raise_for_status()
+                items = parse_json(response)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Error fetching {path}: {e}")
+                return
 
-                assignment_data = response.json()
-                assignments.extend(assignment_data)
+            yield from items
 
-                # Check for pagination
-                links = response.headers.get("Link", "")
-                url = None
-                for link in links.split(","):
-                    if 'rel="next"' in link:
-                        url = link.split(";")[0].strip("<>")
-                        break
+            url = next_page_url(response.headers.get("Link", ""))
+            # The next link already carries the query string
+            params = None
 
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching assignments: {e}")
-                break
+    def get_all_pages(self) -> List[Dict]:
+        return list(self._paginate("pages"))
 
-        return assignments
+    def get_all_assignments(self) -> List[Dict]:
+        """
+        Retrieve all assignments from the Canvas course.
+
+        Returns:
+            List of assignment dictionaries from Canvas API
+        """
+        return list(self._paginate("assignments"))
 
     def filter_pages_to_delete(self, pages: List[Dict]) -> List[Dict]:
         pages_to_delete = []
-
-        # Patterns to match: "Week #" (simple format), "Week #: Topic (Date)" (detailed format), and "HW##"
-        week_pattern = re.compile(r"^Week\s+\d+.*$", re.IGNORECASE)
-        homework_pattern = re.compile(r"^HW\d{2}$", re.IGNORECASE)
+        week_match = _WEEK_RE.match
+        homework_match = _HW_RE.match
 
         for page in pages:
             title = page.get("title", "")
-            if week_pattern.match(title) or homework_pattern.match(title):
+            if not title[:4].lower().startswith(_PAGE_PREFIXES):
+                continue
+            if week_match(title) or homework_match(title):
                 pages_to_delete.append(page)
 
         return pages_to_delete
@@ -98,17 +134,17 @@ class CanvasDeleter:
             List of assignments that should be deleted
         """
         assignments_to_delete = []
-
-        # Patterns to match: "Checkout#", "Quiz#", and "HW##"
-        checkout_pattern = re.compile(r"^Checkout\d+$", re.IGNORECASE)
-        quiz_pattern = re.compile(r"^Quiz\s*\d+$", re.IGNORECASE)
-        homework_pattern = re.compile(r"^HW\d{2}$", re.IGNORECASE)
+        checkout_match = _CHECKOUT_RE.match
+        quiz_match = _QUIZ_RE.match
+        homework_match = _HW_RE.match
 
         for assignment in assignments:
             name = assignment.get("name", "")
-            if (checkout_pattern.match(name) or 
-                quiz_pattern.match(name) or 
-                homework_pattern.match(name)):
+            if not name[:8].lower().startswith(_ASSIGNMENT_PREFIXES):
+                continue
+            if (checkout_match(name) or 
+                quiz_match(name) or 
+                homework_match(name)):
                 assignments_to_delete.append(assignment)
 
         return assignments_to_delete
@@ -128,7 +164,7 @@ class CanvasDeleter:
 
         try:
             url = f"{self.base_url}/courses/{self.course_id}/pages/{page_url}"
-            response = requests.delete(url, headers=self.headers)
+            response = self._delete_with_backoff(url)
             response.raise_for_status()
 
             print(f"✓ Deleted page: '{title}'")
@@ -155,7 +191,7 @@ class CanvasDeleter:
             url = (
                 f"{self.base_url}/courses/{self.course_id}/assignments/{assignment_id}"
             )
-            response = requests.delete(url, headers=self.headers)
+            response = self._delete_with_backoff(url)
             response.raise_for_status()
 
             print(f"✓ Deleted assignment: '{name}'")
@@ -177,8 +213,12 @@ class CanvasDeleter:
         """
         print("🔍 Fetching Canvas items...")
 
-        all_pages = self.get_all_pages()
-        all_assignments = self.get_all_assignments()
+        # Pages and assignments are independent listings, so fetch them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pages_future = executor.submit(self.get_all_pages)
+            assignments_future = executor.submit(self.get_all_assignments)
+            all_pages = pages_future.result()
+            all_assignments = assignments_future.result()
 
         print(
             f"Found {len(all_pages)} total pages and {len(all_assignments)} total assignments"
@@ -218,30 +258,30 @@ class CanvasDeleter:
         pages_deleted = 0
         assignments_deleted = 0
 
-        # Delete pages in parallel
+        # Canvas has no bulk delete for pages or assignments, so the best we can do is
+        # push both kinds through one pool instead of draining pages before assignments
         if pages_to_delete:
             print(f"\nDeleting {len(pages_to_delete)} pages...")
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_page = {
-                    executor.submit(self.delete_page, page): page 
-                    for page in pages_to_delete
-                }
-                
-                for future in as_completed(future_to_page):
-                    if future.result():
-                        pages_deleted += 1
-
-        # Delete assignments in parallel
         if assignments_to_delete:
             print(f"\nDeleting {len(assignments_to_delete)} assignments...")
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_assignment = {
-                    executor.submit(self.delete_assignment, assignment): assignment
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_kind = {
+                executor.submit(self.delete_page, page): "page"
+                for page in pages_to_delete
+            }
+            future_to_kind.update(
+                {
+                    executor.submit(self.delete_assignment, assignment): "assignment"
                     for assignment in assignments_to_delete
                 }
-                
-                for future in as_completed(future_to_assignment):
-                    if future.result():
+            )
+
+            for future in as_completed(future_to_kind):
+                if future.result():
+                    if future_to_kind[future] == "page":
+                        pages_deleted += 1
+                    else:
                         assignments_deleted += 1
 
         print("\n✅ Deletion complete!")
@@ -275,8 +315,8 @@ def main():
     print()
 
     course_id, access_token = get_credentials()
-    deleter = CanvasDeleter(course_id, access_token)
-    pages_deleted, assignments_deleted = deleter.delete_all_matching_items()
+    with CanvasDeleter(course_id, access_token) as deleter:
+        pages_deleted, assignments_deleted = deleter.delete_all_matching_items()
 
     print(
         f"\n📊 Summary: Deleted {pages_deleted} pages and {assignments_deleted} assignments"
@@ -1,8 +1,10 @@
 import os
 import requests
 from datetime import datetime
-from typing import Dict, List
-from jinja2 import Environment, FileSystemLoader
+from typing import Dict, List, Optional
+from files.backend.build_htmls.template_env import TEMPLATE_DIR, get_output_dir, get_template, write_html_files
+from files.backend.populate_weeks import load_learning_objectives
+from files.backend.canvas_session import SESSION, TIMEOUT
 from ..checkout_utils import (
     collect_checkout_assignments,
     find_homework_due_for_checkout,
@@ -28,26 +30,32 @@ def build_checkout_html(
     Returns:
         List of paths to generated checkout HTML files
     """
-    template_dir = os.path.join(
-        os.path.dirname(__file__), "..", "..", "..", "templates"
-    )
-    base_temp_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "temp")
-    output_dir = os.path.join(base_temp_dir, unique_identifier)
-
-    # Create the output directory
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = get_output_dir(unique_identifier)
 
-    print(f"Checkout Template directory: {os.path.abspath(template_dir)}")
+    print(f"Checkout Template directory: {os.path.abspath(TEMPLATE_DIR)}")
     print(f"Checkout Output directory: {os.path.abspath(output_dir)}")
 
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("checkout_template.html")
+    template = get_template("checkout_template.html")
+
+    # Collaboration and communications objectives are the same for every checkout
+    collaboration_objectives = get_collaboration_learning_objectives()
+    communications_objectives = get_communications_learning_objectives()
 
     checkout_files = []
+    outputs = []
     
     # Get all checkouts from the weeks data
     all_checkouts = collect_checkout_assignments(weeks_data)
     
+    # Load the learning objectives once; every checkout only needs its module's entry
+    objectives_path = "files/yaml/learning_objectives.yaml"
+    try:
+        # same libyaml-parsed, mtime-cached copy populate_weeks and the quiz builder use
+        objective_data = load_learning_objectives(objectives_path)
+    except Exception as e:
+        print(f"Warning: Could not load learning objectives from {objectives_path}: {e}")
+        objective_data = {}
+    
     for checkout in all_checkouts:
         # Find the homework due in the same week as this checkout
         hw_number, hw_due_date = find_homework_due_for_checkout(weeks_data, checkout["week_number"])
@@ -64,27 +72,13 @@ def build_checkout_html(
         
         task_text = generate_checkout_task_text(hw_number, str(checkout["checkout_number"]), homework_url)
         
-        # Get learning objectives directly from YAML file using module number
+        # Get learning objectives for this checkout's module
         module_number = checkout["module"]  # This is just checkout_number now
-        try:
-            import yaml
-            objectives_path = "files/yaml/learning_objectives.yaml"
-            with open(objectives_path, "r", encoding="utf-8") as f:
-                objective_data = yaml.safe_load(f)
-            
-            module_objectives = objective_data.get(module_number, {})
-            learning_objectives = module_objectives.get("learning_objectives", [])
-            learning_objectives_topic = module_objectives.get("learning_objectives_topic", "General")
-        except Exception as e:
-            print(f"Warning: Could not load learning objectives for module {module_number}: {e}")
-            learning_objectives = []
-            learning_objectives_topic = "General"
-        
-        # Get collaboration and communications learning objectives
-        collaboration_objectives = get_collaboration_learning_objectives()
-        communications_objectives = get_communications_learning_objectives()
+        module_objectives = objective_data.get(module_number, {})
+        learning_objectives = module_objectives.get("learning_objectives", [])
+        learning_objectives_topic = module_objectives.get("learning_objectives_topic", "General")
         
-        html = template.render(
+        html = template.stream(
             checkout_number=checkout["checkout_number"],
             checkout_date=checkout["date"],
             formatted_due_date=formatted_due_date,
@@ -101,12 +95,12 @@ def build_checkout_html(
         # Write HTML file
         filename = f"checkout_{checkout['checkout_number']}_{unique_identifier}.html"
         output_file = os.path.join(output_dir, filename)
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html)
+        outputs.append((output_file, html))
 
         checkout_files.append(output_file)
         print(f"Generated checkout HTML: {filename}")
 
+    write_html_files(outputs)
     print(f"Generated {len(checkout_files)} checkout HTML files in: {output_dir}")
     return checkout_files
 
@@ -117,6 +111,7 @@ def upload_checkout_assignment(
     course_id: str,
     access_token: str,
     due_date: str = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict:
     """
     Upload a checkout to Canvas as an assignment.
@@ -127,6 +122,7 @@ def upload_checkout_assignment(
         course_id: Canvas course ID
         access_token: Canvas API access token
         due_date: Due date of the checkout in MM/DD/YYYY format
+        session: Optional requests session to send through (defaults to the shared one)
         
     Returns:
         Dictionary with success status and assignment details
@@ -157,10 +153,11 @@ def upload_checkout_assignment(
             assignment_data["assignment[due_at]"] = due_at
 
         # Create the assignment
-        response = requests.post(
+        response = (session or SESSION).post(
             f"https://umich.instructure.com/api/v1/courses/{course_id}/assignments",
             headers={"Authorization": f"Bearer {access_token}"},
             data=assignment_data,
+            timeout=TIMEOUT,
         )
 
         response.raise_for_status()
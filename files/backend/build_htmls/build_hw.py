@@ -2,31 +2,31 @@ import os
 import re
 import requests
 from datetime import datetime
-from typing import Dict, List
-from jinja2 import Environment, FileSystemLoader
+from typing import Dict, List, Optional
+from files.backend.build_htmls.template_env import TEMPLATE_DIR, get_output_dir, get_template, write_html_files
+from files.backend.canvas_session import SESSION, TIMEOUT
 from files.backend.populate_weeks import populate_weeks
 from files.backend.homework_utils import get_all_homework_pdf_links, extract_homework_numbers_from_weeks_data
+from files.backend.populate_weeks_utils import HW_RE, WEEKDAY_ORDER
+
+# Patterns like HW1, HW 2, Homework 3, Assignment 4, etc.
+_HW_PATTERNS = [HW_RE] + [
+    re.compile(p, re.IGNORECASE) for p in (r"Homework\s*(\d+)", r"Assignment\s*(\d+)")
+]
 
 
 def build_homework_html(
     weeks_data: Dict, unique_identifier: str = "hw", course_id: str | None = None, access_token: str | None = None
 ) -> List[str]:
-    template_dir = os.path.join(
-        os.path.dirname(__file__), "..", "..", "..", "templates"
-    )
-    base_temp_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "temp")
-    output_dir = os.path.join(base_temp_dir, unique_identifier)
+    output_dir = get_output_dir(unique_identifier)
 
-    # Create the output directory
-    os.makedirs(output_dir, exist_ok=True)
-
-    print(f"Homework Template directory: {os.path.abspath(template_dir)}")
+    print(f"Homework Template directory: {os.path.abspath(TEMPLATE_DIR)}")
     print(f"Homework Output directory: {os.path.abspath(output_dir)}")
 
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("homework_template.html")
+    template = get_template("homework_template.html")
 
     homework_files = []
+    outputs = []
 
     # Get all homework PDF links if Canvas credentials are available
     homework_pdf_links = {}
@@ -35,46 +35,40 @@ def build_homework_html(
         homework_pdf_links = get_all_homework_pdf_links(course_id, access_token, homework_numbers)
         print(f"Fetched PDF links for {len(homework_pdf_links)} homework assignments")
 
+    # Index every homework's due date in one pass instead of rescanning all weeks per homework
+    due_dates = build_homework_due_date_index(weeks_data)
+
     # Process each week to find homework assignments
     for week_num, week_data in weeks_data.items():
         homework_assignments = []
 
         # Check each day of the week for assignments or due dates
-        for day in [
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        ]:
-            if day in week_data:
-                day_data = week_data[day]
-
-                if (
-                    "assigned" in day_data
-                    and day_data["assigned"]
-                    and "HW" in str(day_data["assigned"]).upper()
-                ):
-                    hw_number = extract_homework_number(day_data["assigned"])
-                    if hw_number:
-                        due_date = find_homework_due_date(weeks_data, hw_number)
-
-                        homework_assignments.append(
-                            {
-                                "number": hw_number,
-                                "assigned_date": day_data["date"],
-                                "due_date": due_date,
-                                "module": week_data.get("module", 1),
-                                "learning_objectives": week_data.get(
-                                    "learning_objectives", []
-                                ),
-                                "learning_objectives_topic": week_data.get(
-                                    "learning_objectives_topic", "General"
-                                ),
-                            }
-                        )
+        for day in WEEKDAY_ORDER:
+            day_data = week_data.get(day)
+            if day_data is None:
+                continue
+
+            # cheap substring check first so the regexes only run on likely homework cells
+            assigned = day_data.get("assigned")
+            if assigned and isinstance(assigned, str) and "hw" in assigned.lower():
+                hw_number = extract_homework_number(assigned)
+                if hw_number:
+                    due_date = due_dates.get(str(int(hw_number)), "TBD")
+
+                    homework_assignments.append(
+                        {
+                            "number": hw_number,
+                            "assigned_date": day_data["date"],
+                            "due_date": due_date,
+                            "module": week_data.get("module", 1),
+                            "learning_objectives": week_data.get(
+                                "learning_objectives", []
+                            ),
+                            "learning_objectives_topic": week_data.get(
+                                "learning_objectives_topic", "General"
+                            ),
+                        }
+                    )
 
         # Generate HTML for each homework assignment found in this week
         for hw in homework_assignments:
@@ -87,7 +81,7 @@ def build_homework_html(
                 homework_pdf_url = homework_pdf_links[hw_key].get("homework_pdf", "")
                 solution_pdf_url = homework_pdf_links[hw_key].get("solution_pdf", "")
             
-            html = template.render(
+            html = template.stream(
                 homework_number=hw["number"],
                 assigned_date=hw["assigned_date"],
                 due_date=hw["due_date"],
@@ -102,12 +96,12 @@ def build_homework_html(
             # Write HTML file
             filename = f"homework_{hw['number']}_{unique_identifier}.html"
             output_file = os.path.join(output_dir, filename)
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(html)
+            outputs.append((output_file, html))
 
             homework_files.append(output_file)
             print(f"Generated homework HTML: {filename}")
 
+    write_html_files(outputs)
     print(f"Generated {len(homework_files)} homework HTML files in: {output_dir}")
     return homework_files
 
@@ -117,35 +111,33 @@ def extract_homework_number(assignment_text: str) -> str:
     if not assignment_text:
         return None
 
-    # Look for patterns like HW1, HW 2, Homework 3, etc.
-    patterns = [r"HW\s*(\d+)", r"Homework\s*(\d+)", r"Assignment\s*(\d+)"]
-
-    for pattern in patterns:
-        match = re.search(pattern, assignment_text, re.IGNORECASE)
+    for pattern in _HW_PATTERNS:
+        match = pattern.search(assignment_text)
         if match:
             return match.group(1)
 
     return None
 
 
-def find_homework_due_date(weeks_data: Dict, hw_number: str) -> str:
-    """Find the due date for a specific homework number across all weeks."""
-    for week_num, week_data in weeks_data.items():
-        for day in [
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        ]:
-            if day in week_data and "due" in week_data[day]:
-                due_text = week_data[day]["due"]
-                if due_text and hw_number in str(due_text):
-                    return week_data[day]["date"]
-
-    return "TBD"
+def build_homework_due_date_index(weeks_data: Dict) -> Dict[str, str]:
+    """
+    Map each homework number found in a 'due' field to the date it is first due.
+
+    Numbers are stored without leading zeros ("HW01" -> "1"), so look them up with
+    str(int(hw_number)) and "HW1" still finds "HW01 due".
+    """
+    due_dates = {}
+    for week_data in weeks_data.values():
+        for day in WEEKDAY_ORDER:
+            day_data = week_data.get(day)
+            if not day_data or not day_data.get("due"):
+                continue
+            due_text = str(day_data["due"])
+            for pattern in _HW_PATTERNS:
+                for hw_number in pattern.findall(due_text):
+                    due_dates.setdefault(str(int(hw_number)), day_data["date"])
+
+    return due_dates
 
 
 def upload_homework_assignment(
@@ -154,6 +146,7 @@ def upload_homework_assignment(
     course_id: str,
     access_token: str,
     due_date: str = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict:
     try:
         due_at = None
@@ -183,10 +176,11 @@ def upload_homework_assignment(
             assignment_data["assignment[due_at]"] = due_at
 
         # Create the assignment
-        response = requests.post(
+        response = (session or SESSION).post(
             f"https://umich.instructure.com/api/v1/courses/{course_id}/assignments",
             headers={"Authorization": f"Bearer {access_token}"},
             data=assignment_data,
+            timeout=TIMEOUT,
         )
 
         response.raise_for_status()
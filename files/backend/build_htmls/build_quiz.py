@@ -1,16 +1,23 @@
 import os
 import re
 import requests
-from datetime import datetime
 from typing import Dict, List, Optional
-from jinja2 import Environment, FileSystemLoader
-from files.backend.populate_weeks_utils import collect_quiz_dates
+from files.backend.canvas_session import SESSION, TIMEOUT
+from files.backend.build_htmls.template_env import TEMPLATE_DIR, get_output_dir, get_template, write_html_files
+from files.backend.populate_weeks import load_learning_objectives
+from files.backend.populate_weeks_utils import collect_quiz_dates, parse_schedule_date
 from ..quiz_utils import (
     get_lesson_range_for_module,
     get_homework_range_for_module,
     format_quiz_date_time
 )
 
+# shared read-only default for chained .get() lookups, so misses don't allocate a fresh {}
+_EMPTY = {}
+
+# Leading "QUIZ N & " on a quiz day's topic, e.g. "QUIZ 2 & Beam Bending" -> "Beam Bending"
+_QUIZ_PREFIX_RE = re.compile(r"^QUIZ\s+\d+\s*&\s*", re.IGNORECASE)
+
 
 def build_quiz_html(
     weeks_data: Dict, unique_identifier: str = "quiz", course_id: str | None = None
@@ -26,37 +33,38 @@ def build_quiz_html(
     Returns:
         List of paths to generated quiz HTML files
     """
-    template_dir = os.path.join(
-        os.path.dirname(__file__), "..", "..", "..", "templates"
-    )
-    base_temp_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "temp")
-    output_dir = os.path.join(base_temp_dir, unique_identifier)
+    # Get all quizzes from the weeks data
+    all_quizzes = collect_quiz_dates(weeks_data)
+    if not all_quizzes:
+        # nothing to render, so skip the output dir, template and YAML work entirely
+        print("No quizzes found, skipping quiz HTML generation")
+        return []
 
-    # Create the output directory
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = get_output_dir(unique_identifier)
 
-    print(f"Quiz Template directory: {os.path.abspath(template_dir)}")
+    print(f"Quiz Template directory: {os.path.abspath(TEMPLATE_DIR)}")
     print(f"Quiz Output directory: {os.path.abspath(output_dir)}")
 
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("quiz_template.html")
+    template = get_template("quiz_template.html")
 
     quiz_files = []
+    outputs = []
     
-    # Get all quizzes from the weeks data
-    all_quizzes = collect_quiz_dates(weeks_data)
-    
+    # Load the learning objectives once for every quiz instead of reparsing per quiz
+    objectives_path = "files/yaml/learning_objectives.yaml"
+    try:
+        objective_data = load_learning_objectives(objectives_path)
+    except Exception as e:
+        print(f"Warning: Could not load learning objectives: {e}")
+        objective_data = {}
+
     for quiz in all_quizzes:
-        # Get the week data for this quiz
-        week_data = weeks_data.get(quiz["week_number"], {})
-        
         # Get the specific day data for this quiz
-        day_data = week_data.get(quiz["day"], {})
-        quiz_info = day_data.get("quiz_info", {})
+        day_data = weeks_data.get(quiz["week_number"], _EMPTY).get(quiz["day"], _EMPTY)
         
         # Extract quiz topic from the day's topic field
         topic = day_data.get("topic", "")
-        quiz_topic = topic.replace(f"QUIZ {quiz['quiz_number']} & ", "")
+        quiz_topic = _QUIZ_PREFIX_RE.sub("", topic)
         
         # Quiz N should test Module N content (Quiz 1 -> Module 1, Quiz 2 -> Module 2, etc.)
         module_number = quiz["quiz_number"]
@@ -69,20 +77,9 @@ def build_quiz_html(
         formatted_quiz_date, day_of_week = format_quiz_date_time(quiz["date"])
         
         # Get learning objectives for the correct module
-        # We need to load the objectives data to get the right module's objectives
-        try:
-            import yaml
-            objectives_path = "files/yaml/learning_objectives.yaml"
-            with open(objectives_path, "r", encoding="utf-8") as f:
-                objective_data = yaml.safe_load(f)
-            
-            module_objectives = objective_data.get(module_number, {})
-            learning_objectives = module_objectives.get("learning_objectives", [])
-            learning_objectives_topic = module_objectives.get("learning_objectives_topic", "General")
-        except Exception as e:
-            print(f"Warning: Could not load learning objectives for module {module_number}: {e}")
-            learning_objectives = []
-            learning_objectives_topic = "General"
+        module_objectives = objective_data.get(module_number, _EMPTY)
+        learning_objectives = module_objectives.get("learning_objectives", [])
+        learning_objectives_topic = module_objectives.get("learning_objectives_topic", "General")
         
         # Load lecture info for the template
         try:
@@ -92,7 +89,7 @@ def build_quiz_html(
             print(f"Warning: Could not load lecture info: {e}")
             lecture_info = {}
         
-        html = template.render(
+        html = template.stream(
             quiz_number=quiz["quiz_number"],
             quiz_date=quiz["date"],
             formatted_quiz_date=formatted_quiz_date,
@@ -102,7 +99,7 @@ def build_quiz_html(
             homework_range=homework_range,
             learning_objectives=learning_objectives,
             learning_objectives_topic=learning_objectives_topic,
-            sample_quiz_url=quiz_info.get("sample_quiz_url", ""),
+            sample_quiz_url=day_data.get("quiz_info", _EMPTY).get("sample_quiz_url", ""),
             course_id=course_id,
             lecture_info=lecture_info,
         )
@@ -110,21 +107,30 @@ def build_quiz_html(
         # Write HTML file
         filename = f"quiz_{quiz['quiz_number']}_{unique_identifier}.html"
         output_file = os.path.join(output_dir, filename)
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html)
+        outputs.append((output_file, html))
 
         quiz_files.append(output_file)
         print(f"Generated quiz HTML: {filename}")
 
+    write_html_files(outputs)
     return quiz_files
 
 
+def _quiz_date_to_iso(quiz_date: str, hour: int, minute: int) -> str:
+    # the shared cached MM/DD/YYYY parser, so "1/5/25" is rejected just like strptime did
+    date_obj = parse_schedule_date(quiz_date)
+    if date_obj is None:
+        raise ValueError(f"Invalid quiz date: {quiz_date!r}")
+    return date_obj.replace(hour=hour, minute=minute).isoformat()
+
+
 def upload_quiz_assignment(
     title: str,
     html_content: str,
     course_id: str,
     access_token: str,
     quiz_date: str = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict:
     """
     Upload a quiz to Canvas as an assignment.
@@ -135,6 +141,7 @@ def upload_quiz_assignment(
         course_id: Canvas course ID
         access_token: Canvas API access token
         quiz_date: Date of the quiz in MM/DD/YYYY format
+        session: Optional requests session to send through (defaults to the shared one)
         
     Returns:
         Dictionary with success status and assignment details
@@ -150,36 +157,35 @@ def upload_quiz_assignment(
                 start_hour = lecture_info.get("start_hour", 11)
                 start_minute = lecture_info.get("start_minute", 30)
                 
-                # Parse MM/DD/YYYY format and convert to ISO 8601
-                parsed_date = datetime.strptime(quiz_date, "%m/%d/%Y")
-                # Set due time to the beginning of class
-                due_at = parsed_date.replace(hour=start_hour, minute=start_minute, second=0).isoformat()
+                # Parse MM/DD/YYYY format and set due time to the beginning of class
+                due_at = _quiz_date_to_iso(quiz_date, start_hour, start_minute)
             except ValueError:
                 print(f"Warning: Could not parse quiz date '{quiz_date}', skipping due date")
             except Exception as e:
                 print(f"Warning: Could not load lecture info for quiz due time: {e}")
                 # Fallback to hardcoded time
-                parsed_date = datetime.strptime(quiz_date, "%m/%d/%Y")
-                due_at = parsed_date.replace(hour=11, minute=30, second=0).isoformat()
-
-        # Prepare assignment data for quiz (no submission required)
-        assignment_data = {
-            "assignment[name]": title,
-            "assignment[description]": html_content,
-            "assignment[submission_types][]": "none",  # No submission required
-            "assignment[points_possible]": 25,  # Standard quiz points
-            "assignment[grading_type]": "points",
-            "assignment[published]": True,  # Published like homework
-        }
+                due_at = _quiz_date_to_iso(quiz_date, 11, 30)
+
+        # Prepare assignment data for quiz (no submission required) as form pairs,
+        # which requests encodes directly and which can repeat keys for multi-value fields
+        assignment_data = [
+            ("assignment[name]", title),
+            ("assignment[description]", html_content),
+            ("assignment[submission_types][]", "none"),  # No submission required
+            ("assignment[points_possible]", 25),  # Standard quiz points
+            ("assignment[grading_type]", "points"),
+            ("assignment[published]", True),  # Published like homework
+        ]
 
         if due_at:
-            assignment_data["assignment[due_at]"] = due_at
+            assignment_data.append(("assignment[due_at]", due_at))
 
         # Create the assignment
-        response = requests.post(
+        response = (session or SESSION).post(
             f"https://umich.instructure.com/api/v1/courses/{course_id}/assignments",
             headers={"Authorization": f"Bearer {access_token}"},
             data=assignment_data,
+            timeout=TIMEOUT,
         )
 
         response.raise_for_status()
@@ -1,7 +1,8 @@
 import os
-import glob
 import pickle
-from jinja2 import Environment, FileSystemLoader
+from concurrent.futures import ThreadPoolExecutor
+from files.backend.canvas_session import BoundedCache
+from files.backend.build_htmls.template_env import TEMPLATE_DIR, get_output_dir, get_template, write_html_files
 from files.backend.populate_weeks import populate_weeks
 from files.backend.build_htmls.build_hw import build_homework_html
 from files.backend.build_htmls.build_quiz import build_quiz_html
@@ -18,8 +19,72 @@ from files.backend.populate_weeks_utils import (
     collect_homework_assignments_due_during_week,
     get_week_days_in_order,
     get_day_color,
+    clear_week_lookup_caches,
+    sorted_weeks,
 )
 
+# unique identifier -> (weeks_data.pkl mtime, weeks_data), so regenerating pages in the same
+# process that built them skips unpickling; capped so a long-running server doesn't grow forever
+_WEEKS_DATA_CACHE = BoundedCache(32)
+
+# (course_id, access_token) -> course PDF URLs, so regenerating pages after an upload
+# doesn't repeat the Canvas folder walk the initial build just did
+_COURSE_PDF_CACHE = BoundedCache(32)
+
+
+def save_weeks_data(temp_dir: str, weeks_data: dict) -> None:
+    """
+    Pickle weeks_data into a build's temp directory and remember it in memory.
+
+    Args:
+        temp_dir: Temp directory for this build (its basename is the unique identifier)
+        weeks_data: Dictionary containing all weeks data
+    """
+    weeks_data_file = os.path.join(temp_dir, "weeks_data.pkl")
+    with open(weeks_data_file, "wb") as f:
+        pickle.dump(weeks_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    _cache_weeks_data(temp_dir, os.path.getmtime(weeks_data_file), weeks_data)
+
+
+def load_weeks_data(temp_dir: str) -> dict:
+    """
+    Load the weeks_data saved for a build, reusing the in-memory copy while the pickle is unchanged.
+
+    Args:
+        temp_dir: Temp directory for this build (its basename is the unique identifier)
+
+    Returns:
+        Dictionary containing all weeks data
+    """
+    weeks_data_file = os.path.join(temp_dir, "weeks_data.pkl")
+    mtime = os.path.getmtime(weeks_data_file)
+    cached = _WEEKS_DATA_CACHE.get(os.path.basename(temp_dir))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(weeks_data_file, "rb") as f:
+        weeks_data = pickle.load(f)
+    _cache_weeks_data(temp_dir, mtime, weeks_data)
+    return weeks_data
+
+
+def _fetch_course_pdfs_cached(course_id: str, access_token: str) -> dict:
+    key = (course_id, access_token)
+    # only non-empty results are ever stored, so a falsy get is a miss
+    pdf_urls = _COURSE_PDF_CACHE.get(key)
+    if pdf_urls:
+        return pdf_urls
+
+    pdf_urls = fetch_course_pdfs(course_id, access_token)
+    # don't remember failed/empty lookups, the next build should get to try again
+    if pdf_urls:
+        _COURSE_PDF_CACHE.set(key, pdf_urls)
+    return pdf_urls
+
+
+def _cache_weeks_data(temp_dir: str, mtime: float, weeks_data: dict) -> None:
+    _WEEKS_DATA_CACHE.set(os.path.basename(temp_dir), (mtime, weeks_data))
+
 
 # builds all html files and returns list containing the built files' names
 def build_html(
@@ -31,23 +96,15 @@ def build_html(
     checkout_urls=None,
     access_token=None,
 ):
-    template_dir = os.path.join(
-        os.path.dirname(__file__), "..", "..", "..", "templates"
-    )
-    base_temp_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "temp")
-    output_dir = os.path.join(base_temp_dir, unique_identifier)
-
-    # create the output directory
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = get_output_dir(unique_identifier)
 
-    print(f"Template directory: {os.path.abspath(template_dir)}")
+    print(f"Template directory: {os.path.abspath(TEMPLATE_DIR)}")
     print(f"Output directory: {os.path.abspath(output_dir)}")
 
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("me2024_template.html")
+    template = get_template("me2024_template.html")
 
-    # Filter out non-numeric keys (like 'icon_urls') before sorting
-    keys = sorted([k for k in weeks_data.keys() if str(k).isdigit()], key=int)
+    # sorted once per weeks_data, so regenerating the same upload's pages skips the sort
+    weeks = sorted_weeks(weeks_data)
 
     if not course_id:
         raise ValueError(
@@ -57,14 +114,26 @@ def build_html(
     # Fetch PDF URLs for course information if access token is provided
     pdf_urls = {}
     if access_token:
-        pdf_urls = fetch_course_pdfs(course_id, access_token)
+        pdf_urls = _fetch_course_pdfs_cached(course_id, access_token)
         print(f"Fetched PDF URLs: {pdf_urls}")
     else:
         print("Warning: No access token provided, course PDFs will not be linked")
 
-    for i, key in enumerate(keys):
-        curr_week = weeks_data[key]
-
+    # every week's title shows up twice (as the "next" link of the week before it and the
+    # "last" link of the week after), so build each title and slug once
+    week_titles = {}
+    for key, _ in weeks:
+        title = get_week_title_with_topic_and_date(weeks_data, int(key))
+        week_titles[int(key)] = (title, title_to_url_safe(title))
+
+    def week_title_and_slug(week_num):
+        if week_num not in week_titles:
+            title = get_week_title_with_topic_and_date(weeks_data, week_num)
+            week_titles[week_num] = (title, title_to_url_safe(title))
+        return week_titles[week_num]
+
+    outputs = []
+    for i, (key, curr_week) in enumerate(weeks):
         # Artificially adjust week numbers to start at 37
         display_week_num = int(key)
 
@@ -77,18 +146,10 @@ def build_html(
         next_slug = None
 
         if prev_week_num > 0:
-            prev_week_title = get_week_title_with_topic_and_date(
-                weeks_data, prev_week_num
-            )
-            # Convert title to URL-safe slug using the same function as everywhere else
-            prev_slug = title_to_url_safe(prev_week_title)
-
-        if i < len(keys) - 1:
-            next_week_title = get_week_title_with_topic_and_date(
-                weeks_data, next_week_num
-            )
-            # Convert title to URL-safe slug using the same function as everywhere else
-            next_slug = title_to_url_safe(next_week_title)
+            prev_week_title, prev_slug = week_title_and_slug(prev_week_num)
+
+        if i < len(weeks) - 1:
+            next_week_title, next_slug = week_title_and_slug(next_week_num)
 
         # Generate navigation text with links using new title format
         if prev_slug:
@@ -121,7 +182,7 @@ def build_html(
         for idx, day in enumerate(week_days):
             day["color"] = get_day_color(idx)
 
-        html = template.render(
+        html = template.stream(
             week=curr_week,
             week_number=display_week_num,
             last_week_text=last_week_text,
@@ -143,9 +204,9 @@ def build_html(
         # write each HTML file to the unique output subdirectory
         filename = f"week_{display_week_num}_{unique_identifier}.html"
         output_file = os.path.join(output_dir, filename)
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html)
+        outputs.append((output_file, html))
 
+    write_html_files(outputs)
     print(f"Rendered HTML files for all weeks in: {output_dir}")
 
 
@@ -162,33 +223,17 @@ def regenerate_weekly_pages_with_homework_urls(
     This function is called after homework assignments and quizzes are uploaded to Canvas.
     """
 
-    # Look for a saved weeks_data file or reconstruct from existing files
+    # Look for the weeks_data saved when the pages were first built
     weeks_data_file = os.path.join(temp_dir, "weeks_data.pkl")
 
-    if os.path.exists(weeks_data_file):
-        # Load the saved weeks data
-        with open(weeks_data_file, "rb") as f:
-            weeks_data = pickle.load(f)
-    else:
-        # If no saved data, we need to extract the unique identifier and regenerate
-        # Find any existing weekly file to extract the unique identifier
-        weekly_files = glob.glob(os.path.join(temp_dir, "week_*.html"))
-        if not weekly_files:
-            raise Exception("No weekly files found to extract identifier")
-
-        # Extract unique identifier from filename
-        filename = os.path.basename(weekly_files[0])
-        # Format: week_1_<unique_identifier>.html
-        parts = filename.split("_")
-        if len(parts) >= 3:
-            unique_identifier = "_".join(parts[2:]).replace(".html", "")
-        else:
-            raise Exception("Could not extract unique identifier from filename")
-
-        # We'll need to regenerate from scratch - this is a fallback
-        # For now, let's use the existing approach but this is not ideal
+    if not os.path.exists(weeks_data_file):
+        # the unique identifier comes from temp_dir itself, but without the original
+        # weeks data there's nothing to rebuild the pages from
         raise Exception("Cannot regenerate without original weeks data")
 
+    # Load the saved weeks data
+    weeks_data = load_weeks_data(temp_dir)
+
     # Extract unique identifier from temp_dir path
     unique_identifier = os.path.basename(temp_dir)
 
@@ -204,7 +249,17 @@ def regenerate_weekly_pages_with_homework_urls(
     )
 
     # Return list of regenerated weekly files
-    return glob.glob(os.path.join(temp_dir, "week_*.html"))
+    return _list_week_htmls(temp_dir)
+
+
+def _list_week_htmls(temp_dir: str) -> list:
+    # one scandir pass instead of glob's pattern compile and per-entry checks
+    with os.scandir(temp_dir) as entries:
+        return [
+            entry.path
+            for entry in entries
+            if entry.name.startswith("week_") and entry.name.endswith(".html")
+        ]
 
 
 # builds the html files from the upload,
@@ -216,6 +271,11 @@ def build_from_upload(
     course_id: str = None,
     access_token: str = None,
 ) -> str:
+    # lookups memoized for earlier uploads' weeks_data won't be hit again
+    clear_week_lookup_caches()
+    # a new upload should pick up any PDFs changed in Canvas since the last one
+    _COURSE_PDF_CACHE.pop((course_id, access_token), None)
+
     ext = os.path.splitext(file.filename)[1].lower()
     unique_identifier = uuid_module.uuid4().hex
     unique_filename = f"{unique_identifier}{ext}"
@@ -241,20 +301,33 @@ def build_from_upload(
     )
 
     # Save the weeks data for later use in regeneration
-    temp_dir = os.path.join("temp", unique_identifier)
-    os.makedirs(temp_dir, exist_ok=True)
-    weeks_data_file = os.path.join(temp_dir, "weeks_data.pkl")
-    with open(weeks_data_file, "wb") as f:
-        pickle.dump(weekly_page_data, f)
-
-    build_html(
-        weekly_page_data, unique_identifier, course_id, access_token=access_token
-    )
-    build_homework_html(weekly_page_data, unique_identifier, course_id, access_token)
-    build_quiz_html(weekly_page_data, unique_identifier, course_id)  # Add quiz building
-    build_checkout_html(
-        weekly_page_data, unique_identifier, course_id
-    )  # Add checkout building (no homework URLs yet)
+    temp_dir = get_output_dir(unique_identifier)
+    save_weeks_data(temp_dir, weekly_page_data)
+
+    # the builders only read weeks_data, and the week and homework builders spend most of
+    # their time waiting on Canvas, so run all four side by side instead of one after another
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        builds = [
+            executor.submit(
+                build_html,
+                weekly_page_data,
+                unique_identifier,
+                course_id,
+                access_token=access_token,
+            ),
+            executor.submit(
+                build_homework_html,
+                weekly_page_data,
+                unique_identifier,
+                course_id,
+                access_token,
+            ),
+            executor.submit(build_quiz_html, weekly_page_data, unique_identifier, course_id),
+            # no homework URLs yet, checkouts get rebuilt with them after upload
+            executor.submit(build_checkout_html, weekly_page_data, unique_identifier, course_id),
+        ]
+        for build in builds:
+            build.result()
 
     os.remove(excel_schedule_path)
 
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from jinja2.environment import TemplateStream
+
+# resolved once at import rather than rebuilt from __file__ on every build call
+_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+TEMPLATE_DIR = os.path.join(_ROOT_DIR, "templates")
+TEMP_DIR = os.path.join(_ROOT_DIR, "temp")
+
+# one environment shared by every builder so each template is parsed and compiled once
+# instead of on every build call. auto_reload costs one stat per lookup, and in exchange a
+# running server picks up template edits on the next build like it did before
+_ENV = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    auto_reload=True,
+    cache_size=400,
+    # compiled bytecode is persisted so new processes skip the parse step too. no directory is
+    # passed on purpose: jinja then uses its own per-user _jinja2-cache-<uid> dir and checks it's
+    # 0700 and ours, so nobody else on the host can plant bytecode for us to load
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+
+# pages are streamed to disk in chunks rather than built up as one big string first.
+# the streams are lazy, so each page is actually rendered on the pool thread that writes it,
+# which lets one page's template work overlap with another's disk I/O
+_WRITE_WORKERS = min(8, os.cpu_count() or 4)
+# stream() hands back lots of small chunks; a 64KB buffer batches them into fewer write syscalls
+_WRITE_BUFFER_SIZE = 1 << 16
+
+_CREATED_OUTPUT_DIRS = set()
+
+
+def get_template(name: str) -> Template:
+    """
+    Get a compiled template from the shared Jinja2 environment.
+
+    Args:
+        name: Template filename inside the templates directory
+
+    Returns:
+        The compiled Jinja2 template (cached by the environment until the file changes)
+    """
+    return _ENV.get_template(name)
+
+
+def get_output_dir(unique_identifier: str) -> str:
+    """
+    Get a build's output directory under TEMP_DIR, creating it the first time it's asked for.
+
+    Args:
+        unique_identifier: Unique identifier for the build session
+
+    Returns:
+        Absolute path of the output directory
+    """
+    output_dir = os.path.join(TEMP_DIR, unique_identifier)
+    # every sub-builder of an upload asks for the same directory, so only hit the filesystem once
+    if output_dir not in _CREATED_OUTPUT_DIRS:
+        os.makedirs(output_dir, exist_ok=True)
+        _CREATED_OUTPUT_DIRS.add(output_dir)
+    return output_dir
+
+
+def _write_html(path: str, stream: TemplateStream) -> None:
+    # binary file + dump's own encoder skips the text I/O layer's per-chunk encode/newline pass
+    with open(path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+        stream.dump(f, encoding="utf-8")
+
+
+def write_html_files(files: Iterable[Tuple[str, TemplateStream]]) -> None:
+    """
+    Render template streams straight to disk concurrently.
+
+    Args:
+        files: (output path, template.stream(...) result) pairs to write
+    """
+    with ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as executor:
+        # list() so any write error is raised here instead of being swallowed
+        list(executor.map(lambda pair: _write_html(*pair), files))
@@ -0,0 +1,237 @@
+import re
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+try:
+    # orjson parses straight from the response bytes and is a good deal faster than stdlib json
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    _json_loads = json.loads
+
+# one pooled session shared by every Canvas call in the process, so repeated requests
+# reuse keep-alive connections instead of paying a TCP+TLS handshake each time.
+# auth headers stay per request since different users' tokens go through the same app
+SESSION = requests.Session()
+# urllib3 only retries idempotent methods by default, so a failed POST never double-creates
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+SESSION.mount("https://", _ADAPTER)
+
+# (connect, read) seconds, so a stalled Canvas call can't hang an upload worker forever
+TIMEOUT = (5, 30)
+
+# Canvas throttles bursts per token, so keep the fan-out modest
+UPLOAD_WORKERS = 6
+# read-only listings are cheaper on Canvas's side, so lookups can fan out a little wider
+FETCH_WORKERS = 8
+
+
+class BoundedCache:
+    """A small thread-safe cache that drops its oldest entry once it holds maxsize items."""
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+        # lookups run from pool threads, and evicting while another thread inserts would break
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            # re-setting a key moves it to the back, so it's evicted last
+            self._data.pop(key, None)
+            if len(self._data) >= self._maxsize:
+                self._data.popitem(last=False)
+            self._data[key] = value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Canvas paginates with a Link header like: <url>; rel="current",<url>; rel="next",...
+_NEXT_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+# (url, auth header) -> (etag, payload, next url) for listing pages we've already seen.
+# folder listings rarely change between builds, so most revalidations come back 304 with no body.
+# kept in memory only so one user's listings never get written to disk
+_LISTING_CACHE = BoundedCache(256)
+
+# folder IDs remembered per (course_id, access_token); folders don't move between builds
+_FOLDER_ID_CACHE_SIZE = 64
+
+
+def cache_folder_id(func: Callable[[str, str], Optional[str]]) -> Callable[[str, str], Optional[str]]:
+    """
+    Memoize a folder-ID lookup by (course_id, access_token).
+
+    Unlike lru_cache, a None result (folder missing or request failed) isn't remembered,
+    so the next call gets to try again.
+
+    Args:
+        func: Lookup taking (course_id, access_token) and returning a folder ID or None
+
+    Returns:
+        The wrapped lookup
+    """
+    cache = BoundedCache(_FOLDER_ID_CACHE_SIZE)
+
+    @wraps(func)
+    def wrapper(course_id: str, access_token: str):
+        key = (course_id, access_token)
+        folder_id = cache.get(key)
+        if folder_id is not None:
+            return folder_id
+        folder_id = func(course_id, access_token)
+        if folder_id is not None:
+            cache.set(key, folder_id)
+        return folder_id
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+def parse_json(response: requests.Response) -> Any:
+    """
+    Decode a Canvas JSON response body.
+
+    Args:
+        response: Successful response from the Canvas API
+
+    Returns:
+        The decoded JSON payload
+    """
+    return _json_loads(response.content)
+
+
+def next_page_url(link_header: str) -> Optional[str]:
+    """
+    Pull the rel="next" URL out of a Canvas Link header.
+
+    Args:
+        link_header: Value of the response's Link header (may be empty)
+
+    Returns:
+        URL of the next page, or None on the last page
+    """
+    match = _NEXT_LINK_RE.search(link_header)
+    return match.group(1) if match else None
+
+
+def get_json_page(url: str, headers: Dict[str, str]) -> Tuple[Any, Optional[str]]:
+    """
+    GET one page of a Canvas listing, revalidating pages we've seen before with their ETag.
+
+    Args:
+        url: Page URL (the first page, or a rel="next" link from the previous one)
+        headers: Request headers, including the Authorization bearer token
+
+    Returns:
+        (decoded JSON payload, next page URL or None on the last page)
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails or Canvas returns an error status
+    """
+    key = (url, headers.get("Authorization"))
+    cached = _LISTING_CACHE.get(key)
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
+
+    response = SESSION.get(url, headers=headers, timeout=TIMEOUT)
+    if cached is not None and response.status_code == 304:
+        return cached[1], cached[2]
+    response.raise_for_status()
+
+    payload = parse_json(response)
+    next_url = next_page_url(response.headers.get("Link", ""))
+    etag = response.headers.get("ETag")
+    if etag:
+        _LISTING_CACHE.set(key, (etag, payload, next_url))
+    return payload, next_url
+
+
+def find_course_folder_id(course_id: str, access_token: str, folder_name: str) -> Optional[str]:
+    """
+    Find a top-level folder in a Canvas course's files by name (case-insensitive).
+
+    Args:
+        course_id: Canvas course ID
+        access_token: Canvas API access token
+        folder_name: Folder name to look for (e.g., "Site Data")
+
+    Returns:
+        String ID of the folder or None if not found
+    """
+    headers = {"Authorization": f"Bearer {access_token}"}
+    base_url = "https://umich.instructure.com/api/v1"
+    url = f"{base_url}/courses/{course_id}/folders"
+    target = folder_name.lower()
+
+    try:
+        while url:
+            folders, next_url = get_json_page(url, headers)
+
+            for folder in folders:
+                if folder.get("name", "").lower() == target:
+                    return str(folder.get("id"))
+
+            # Check for pagination
+            url = next_url
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching folders: {e}")
+        return None
+    except Exception as e:
+        print(f"Error processing folders: {e}")
+        return None
+
+    return None
+
+
+def bulk_upload(
+    items: Iterable[Dict], uploader: Callable[..., Dict], max_workers: int = UPLOAD_WORKERS
+) -> Iterator[Tuple[Dict, Dict]]:
+    """
+    Run an upload helper for many items concurrently, yielding results as they finish.
+
+    Args:
+        items: Keyword-argument dicts to pass to the uploader, one per upload
+        uploader: Upload function returning a result dict with a "success" key
+        max_workers: Maximum number of uploads in flight at once
+
+    Yields:
+        (item, result) tuples in completion order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_item = {executor.submit(uploader, **item): item for item in items}
+        for future in as_completed(future_to_item):
+            item = future_to_item[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    "success": False,
+                    "error": f"Unexpected error: {str(e)}",
+                    "title": item.get("title"),
+                }
+            yield item, result
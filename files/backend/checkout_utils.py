@@ -1,8 +1,27 @@
 import re
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from functools import lru_cache
+from files.backend.populate_weeks_utils import (
+    HW_RE,
+    WEEKDAY_ORDER,
+    WeeksHandle,
+    parse_schedule_date,
+    sorted_weeks,
+)
 
+# Compiled once; IGNORECASE covers "CHECKOUT 1", "Checkout 2", "checkout 3", etc.
+_CHECKOUT_RE = re.compile(r"CHECKOUT\s*(\d+)", re.IGNORECASE)
 
+# every casing HW_RE accepts; a few C-level substring checks are far cheaper than a regex call,
+# and most due cells don't mention homework at all
+_HW_CASINGS = ("HW", "hw", "Hw", "hW")
+
+# week dicts also hold keys like "module" and "image", this picks out just the days
+_DAYS = frozenset(WEEKDAY_ORDER)
+
+
+# topics repeat a lot across weeks (and are often empty), so remember the answer per string
+@lru_cache(maxsize=256)
 def extract_checkout_number(topic: str) -> Optional[str]:
     """
     Extract checkout number from topic text like 'CHECKOUT 1', 'Checkout 2', etc.
@@ -17,18 +36,8 @@ def extract_checkout_number(topic: str) -> Optional[str]:
         return None
     
     # Look for patterns like "CHECKOUT 1", "Checkout 2", etc.
-    patterns = [
-        r"CHECKOUT\s*(\d+)",
-        r"Checkout\s*(\d+)",
-        r"checkout\s*(\d+)"
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, topic, re.IGNORECASE)
-        if match:
-            return match.group(1)
-    
-    return None
+    match = _CHECKOUT_RE.search(topic)
+    return match.group(1) if match else None
 
 
 def collect_checkout_assignments(weeks_data: Dict) -> List[Dict]:
@@ -42,34 +51,41 @@ def collect_checkout_assignments(weeks_data: Dict) -> List[Dict]:
     Returns:
         List of checkout dictionaries with checkout_number, date, week_number, module
     """
-    checkouts = []
+    return _collect_checkout_assignments(WeeksHandle(weeks_data))
+
+
+@lru_cache(maxsize=16)
+def _collect_checkout_assignments(handle: WeeksHandle) -> List[Dict]:
+    # the checkout builder and every find_next_checkout call share one walk over the weeks
+    weeks_data = handle.weeks_data
+    # keyed by checkout number so a checkout listed on more than one day is only emitted once
+    checkouts_by_num: Dict[int, Dict] = {}
     
-    for week_num, week_data in weeks_data.items():
-        # Skip non-numeric keys like 'icon_urls'
-        if not str(week_num).isdigit():
-            continue
-            
+    # sorted_weeks already skips non-numeric keys like 'icon_urls' (and is cached per weeks_data)
+    for week_num, week_data in sorted_weeks(weeks_data):
         # Check each day of the week for checkout topics
-        for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]:
-            if day in week_data:
-                day_data = week_data[day]
-                topic = day_data.get("topic", "")
-                
-                checkout_number = extract_checkout_number(topic)
-                if checkout_number:
-                    # Simple mapping: Checkout N = Module N
-                    module_number = int(checkout_number)
-                    checkouts.append({
-                        "checkout_number": int(checkout_number),
-                        "date": day_data.get("date", ""),
-                        "week_number": week_num,
-                        "day": day,
-                        "module": module_number,
-                    })
+        for day, day_data in week_data.items():
+            if day not in _DAYS:
+                continue
+            topic = day_data.get("topic", "")
+            
+            checkout_number = extract_checkout_number(topic)
+            if checkout_number:
+                # Simple mapping: Checkout N = Module N
+                module_number = int(checkout_number)
+                if module_number in checkouts_by_num:
+                    # keep the first day it shows up
+                    continue
+                checkouts_by_num[module_number] = {
+                    "checkout_number": module_number,
+                    "date": day_data.get("date", ""),
+                    "week_number": week_num,
+                    "day": day,
+                    "module": module_number,
+                }
     
-    # Sort by checkout number to ensure proper ordering
-    checkouts.sort(key=lambda x: x["checkout_number"])
-    return checkouts
+    # Order by checkout number to ensure proper ordering
+    return [checkouts_by_num[num] for num in sorted(checkouts_by_num)]
 
 
 def find_homework_due_for_checkout(weeks_data: Dict, checkout_week_num: int) -> Tuple[Optional[str], Optional[str]]:
@@ -88,19 +104,22 @@ def find_homework_due_for_checkout(weeks_data: Dict, checkout_week_num: int) ->
     
     week_data = weeks_data[checkout_week_num]
     
-    # Check each day of the checkout week for homework due
-    for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]:
-        if day in week_data:
-            day_data = week_data[day]
-            due_text = day_data.get("due", "")
-            
-            if due_text and "HW" in str(due_text).upper():
-                # Extract homework number
-                hw_match = re.search(r'HW\s*(\d+)', str(due_text), re.IGNORECASE)
-                if hw_match:
-                    hw_number = hw_match.group(1)
-                    due_date = day_data.get("date", "")
-                    return hw_number, due_date
+    # Check each day of the checkout week for homework due.
+    # walks the days in weekday order (not dict order) since the first match wins
+    for day in WEEKDAY_ORDER:
+        day_data = week_data.get(day)
+        if day_data is None:
+            continue
+        due_text = day_data.get("due", "")
+        
+        # non-string cells can't hold "HW"; only run the regex once a substring check says it might match
+        if not isinstance(due_text, str) or not any(casing in due_text for casing in _HW_CASINGS):
+            continue
+        hw_match = HW_RE.search(due_text)
+        if hw_match:
+            hw_number = hw_match.group(1)
+            due_date = day_data.get("date", "")
+            return hw_number, due_date
     
     return None, None
 
@@ -131,6 +150,7 @@ def get_communications_learning_objectives() -> List[str]:
     ]
 
 
+@lru_cache(maxsize=256)
 def format_checkout_due_date(checkout_date: str) -> str:
     """
     Format checkout date for the due date section.
@@ -141,21 +161,13 @@ def format_checkout_due_date(checkout_date: str) -> str:
     Returns:
         Formatted date string like "Friday, 1/24/2025"
     """
-    try:
-        # Parse the date
-        date_obj = datetime.strptime(checkout_date, "%m/%d/%Y")
-        
-        # Format as "Friday, 1/24/2025"
-        day_name = date_obj.strftime("%A")
-        month = date_obj.month
-        day = date_obj.day
-        year = date_obj.year
-        
-        return f"{day_name}, {month}/{day}/{year}"
-        
-    except ValueError:
+    date_obj = parse_schedule_date(checkout_date)
+    if date_obj is None:
         # If parsing fails, return the original date
         return checkout_date
+    
+    # Format as "Friday, 1/24/2025"
+    return f"{date_obj.strftime('%A')}, {date_obj.month}/{date_obj.day}/{date_obj.year}"
 
 
 def generate_checkout_task_text(homework_number: str, checkout_number: str, homework_url: str = None) -> str:
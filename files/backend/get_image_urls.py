@@ -2,42 +2,12 @@ import requests
 import re
 from typing import Dict, Optional
 from urllib.parse import quote
+from files.backend.canvas_session import cache_folder_id, find_course_folder_id, get_json_page
 
 
+@cache_folder_id
 def fetch_site_data_folder_id(course_id: str, access_token: str) -> Optional[str]:
-    headers = {"Authorization": f"Bearer {access_token}"}
-    base_url = "https://umich.instructure.com/api/v1"
-    url = f"{base_url}/courses/{course_id}/folders"
-    
-    try:
-        while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            folders = response.json()
-            
-            # Look for "Site Data" folder
-            for folder in folders:
-                folder_name = folder.get("name", "")
-                if folder_name.lower() == "site data":
-                    return str(folder.get("id"))
-            
-            # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
-                    
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching folders: {e}")
-        return None
-    except Exception as e:
-        print(f"Error processing folders: {e}")
-        return None
-        
-    return None
+    return find_course_folder_id(course_id, access_token, "Site Data")
 
 
 def fetch_image_urls_from_site_data(course_id: str, access_token: str, image_names: list) -> Dict[str, str]:
@@ -55,16 +25,17 @@ def fetch_image_urls_from_site_data(course_id: str, access_token: str, image_nam
     
     print(f"Found Site Data folder with ID: {site_data_folder_id}")
     
+    # hash lookups instead of rescanning image_names for every file in the folder
+    image_names_set = set(image_names)
+    
     headers = {"Authorization": f"Bearer {access_token}"}
     base_url = "https://umich.instructure.com/api/v1"
-    url = f"{base_url}/folders/{site_data_folder_id}/files"
+    # Canvas defaults to 10 files per page; ask for the max so the listing is a round trip or two
+    url = f"{base_url}/folders/{site_data_folder_id}/files?per_page=100"
     
     try:
         while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            files = response.json()
+            files, next_url = get_json_page(url, headers)
             
             # Process each file to find matching image names
             for file_info in files:
@@ -72,21 +43,14 @@ def fetch_image_urls_from_site_data(course_id: str, access_token: str, image_nam
                 file_id = file_info.get("id")
                 
                 # Check if this file name matches any of our target image names
-                for target_name in image_names:
-                    if file_name == target_name:
-                        # Create the Canvas preview URL
-                        preview_url = f"https://umich.instructure.com/courses/{course_id}/files/{file_id}/preview"
-                        image_urls[target_name] = preview_url
-                        print(f"Found image: {target_name} -> {preview_url}")
-                        break
+                if file_name in image_names_set:
+                    # Create the Canvas preview URL
+                    preview_url = f"https://umich.instructure.com/courses/{course_id}/files/{file_id}/preview"
+                    image_urls[file_name] = preview_url
+                    print(f"Found image: {file_name} -> {preview_url}")
             
             # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
+            url = next_url
                     
     except requests.exceptions.RequestException as e:
         print(f"Error fetching files from Site Data folder: {e}")
@@ -94,7 +58,7 @@ def fetch_image_urls_from_site_data(course_id: str, access_token: str, image_nam
         print(f"Error processing files from Site Data folder: {e}")
     
     # Log any missing images
-    missing_images = set(image_names) - set(image_urls.keys())
+    missing_images = image_names_set - image_urls.keys()
     if missing_images:
         print(f"Warning: Could not find the following images in Site Data folder: {missing_images}")
     
@@ -124,22 +88,17 @@ def get_image_urls_for_yaml_data(images_data: Dict, course_id: str = None, acces
     # Process weekly images (maintain existing structure)
     updated_weekly_images = {}
     for week_key, week_data in weekly_images.items():
-        updated_data = week_data.copy()
         image_name = week_data.get("image_name")
         
         if image_name and image_name in image_urls:
-            # Replace image_name with image_path containing the Canvas URL
-            updated_data["image_path"] = image_urls[image_name]
-            # Keep image_name for reference if needed
-            updated_data["image_name"] = image_name
+            # Add image_path containing the Canvas URL (image_name is kept for reference)
+            updated_weekly_images[week_key] = {**week_data, "image_path": image_urls[image_name]}
         else:
             # If we can't find the image, provide a fallback or warning
             print(f"Warning: Could not find Canvas URL for image '{image_name}' in week {week_key}")
-            # Keep the original image_name and add a placeholder path
-            updated_data["image_path"] = f"https://via.placeholder.com/400x300?text={quote(image_name or 'Image Not Found')}"
-            updated_data["image_name"] = image_name
-            
-        updated_weekly_images[week_key] = updated_data
+            # Keep the original image_name and add a placeholder path (only quoted when it's needed)
+            placeholder = f"https://via.placeholder.com/400x300?text={quote(image_name or 'Image Not Found')}"
+            updated_weekly_images[week_key] = {**week_data, "image_path": placeholder, "image_name": image_name}
     
     # Process special icons
     icon_urls = {}
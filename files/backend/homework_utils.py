@@ -1,9 +1,15 @@
 import requests
-import re
 from typing import Dict, Optional, List
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from files.backend.populate_weeks_utils import HW_RE, WEEKDAY_ORDER, sorted_weeks
+from files.backend.canvas_session import FETCH_WORKERS, cache_folder_id, find_course_folder_id, get_json_page
 
+# week dicts also hold keys like "module" and "image", this picks out just the days
+_DAYS = frozenset(WEEKDAY_ORDER)
 
+
+@cache_folder_id
 def fetch_assignments_folder_id(course_id: str, access_token: str) -> Optional[str]:
     """
     Fetch the Assignments folder ID from Canvas course files.
@@ -15,98 +21,73 @@ def fetch_assignments_folder_id(course_id: str, access_token: str) -> Optional[s
     Returns:
         String ID of the Assignments folder or None if not found
     """
-    headers = {"Authorization": f"Bearer {access_token}"}
-    base_url = "https://umich.instructure.com/api/v1"
-    url = f"{base_url}/courses/{course_id}/folders"
-    
-    try:
-        while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            folders = response.json()
-            
-            # Look for "Assignments" folder
-            for folder in folders:
-                folder_name = folder.get("name", "")
-                if folder_name.lower() == "assignments":
-                    return str(folder.get("id"))
-            
-            # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
-                    
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching folders: {e}")
-        return None
-    except Exception as e:
-        print(f"Error processing folders: {e}")
-        return None
-        
-    return None
+    return find_course_folder_id(course_id, access_token, "Assignments")
 
 
-def fetch_homework_folder_id(course_id: str, access_token: str, homework_number: str) -> Optional[str]:
+def fetch_homework_folder_ids(course_id: str, access_token: str) -> Dict[str, str]:
     """
-    Fetch the specific homework folder ID (e.g., HW01) from the Assignments folder.
+    Fetch every homework folder ID under the Assignments folder in one listing.
     
     Args:
         course_id: Canvas course ID
         access_token: Canvas API access token
-        homework_number: Homework number (e.g., "1", "2", "10")
         
     Returns:
-        String ID of the homework folder or None if not found
+        Dictionary mapping upper-cased folder names (e.g., "HW01") to folder IDs
     """
+    folder_ids = {}
+    
     # First get the Assignments folder ID
     assignments_folder_id = fetch_assignments_folder_id(course_id, access_token)
     if not assignments_folder_id:
         print("Warning: Could not find 'Assignments' folder in Canvas course")
-        return None
+        return folder_ids
     
     headers = {"Authorization": f"Bearer {access_token}"}
     base_url = "https://umich.instructure.com/api/v1"
     url = f"{base_url}/folders/{assignments_folder_id}/folders"
     
-    # Format homework number with leading zero if needed
-    hw_folder_name = f"HW{int(homework_number):02d}"
-    
     try:
         while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
+            folders, next_url = get_json_page(url, headers)
             
-            folders = response.json()
-            
-            # Look for specific homework folder (e.g., "HW01")
+            # keep the first folder seen for each name, same as the old per-homework scan
             for folder in folders:
-                folder_name = folder.get("name", "")
-                if folder_name.upper() == hw_folder_name.upper():
-                    return str(folder.get("id"))
+                folder_name = folder.get("name", "").upper()
+                if folder_name not in folder_ids:
+                    folder_ids[folder_name] = str(folder.get("id"))
             
             # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
+            url = next_url
                     
     except requests.exceptions.RequestException as e:
         print(f"Error fetching homework folders: {e}")
-        return None
     except Exception as e:
         print(f"Error processing homework folders: {e}")
-        return None
         
-    return None
+    return folder_ids
+
+
+def fetch_homework_folder_id(course_id: str, access_token: str, homework_number: str) -> Optional[str]:
+    """
+    Fetch the specific homework folder ID (e.g., HW01) from the Assignments folder.
+    
+    Args:
+        course_id: Canvas course ID
+        access_token: Canvas API access token
+        homework_number: Homework number (e.g., "1", "2", "10")
+        
+    Returns:
+        String ID of the homework folder or None if not found
+    """
+    # Format homework number with leading zero if needed
+    hw_folder_name = f"HW{int(homework_number):02d}"
+    return fetch_homework_folder_ids(course_id, access_token).get(hw_folder_name)
 
 
-def fetch_homework_pdf_links(course_id: str, access_token: str, homework_number: str) -> Dict[str, str]:
+def fetch_homework_pdf_links(
+    course_id: str, access_token: str, homework_number: str, homework_folder_ids: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
     """
     Fetch the homework PDF and solution PDF links for a specific homework assignment.
     
@@ -114,6 +95,8 @@ def fetch_homework_pdf_links(course_id: str, access_token: str, homework_number:
         course_id: Canvas course ID
         access_token: Canvas API access token
         homework_number: Homework number (e.g., "1", "2", "10")
+        homework_folder_ids: Optional result of fetch_homework_folder_ids, so callers looking up
+            several homeworks only list the Assignments folder once
         
     Returns:
         Dictionary with keys 'homework_pdf' and 'solution_pdf' containing Canvas URLs
@@ -128,7 +111,10 @@ def fetch_homework_pdf_links(course_id: str, access_token: str, homework_number:
         return pdf_links
     
     # Get the homework folder ID
-    homework_folder_id = fetch_homework_folder_id(course_id, access_token, homework_number)
+    if homework_folder_ids is None:
+        homework_folder_id = fetch_homework_folder_id(course_id, access_token, homework_number)
+    else:
+        homework_folder_id = homework_folder_ids.get(f"HW{int(homework_number):02d}")
     if not homework_folder_id:
         print(f"Warning: Could not find homework folder for HW{int(homework_number):02d}")
         return pdf_links
@@ -137,16 +123,16 @@ def fetch_homework_pdf_links(course_id: str, access_token: str, homework_number:
     
     headers = {"Authorization": f"Bearer {access_token}"}
     base_url = "https://umich.instructure.com/api/v1"
-    url = f"{base_url}/folders/{homework_folder_id}/files"
-    
     hw_formatted = f"HW{int(homework_number):02d}"
     
+    # let Canvas filter by name server-side so we only page through the HW## files
+    url = f"{base_url}/folders/{homework_folder_id}/files?search_term={hw_formatted}&per_page=100"
+    
+    hw_upper = hw_formatted.upper()
+    
     try:
         while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            files = response.json()
+            files, next_url = get_json_page(url, headers)
             
             # Process each file to find homework and solution PDFs
             for file_info in files:
@@ -157,26 +143,27 @@ def fetch_homework_pdf_links(course_id: str, access_token: str, homework_number:
                 if not file_name.lower().endswith('.pdf'):
                     continue
                 
+                # upper-case the name once and reuse it for both checks
+                name_upper = file_name.upper()
+                if hw_upper not in name_upper:
+                    continue
+                is_solution = "SOLUTIONS" in name_upper
+                
                 # Create the Canvas preview URL
                 preview_url = f"https://umich.instructure.com/courses/{course_id}/files/{file_id}/preview"
                 
                 # Check if this is the homework PDF (contains HW## but not "Solutions")
-                if hw_formatted.upper() in file_name.upper() and "SOLUTIONS" not in file_name.upper():
+                if not is_solution:
                     pdf_links["homework_pdf"] = preview_url
                     print(f"Found homework PDF: {file_name} -> {preview_url}")
                 
                 # Check if this is the solution PDF (contains HW##_Solutions)
-                elif hw_formatted.upper() in file_name.upper() and "SOLUTIONS" in file_name.upper():
+                else:
                     pdf_links["solution_pdf"] = preview_url
                     print(f"Found solution PDF: {file_name} -> {preview_url}")
             
             # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
+            url = next_url
                     
     except requests.exceptions.RequestException as e:
         print(f"Error fetching files from homework folder: {e}")
@@ -210,11 +197,24 @@ def get_all_homework_pdf_links(course_id: str, access_token: str, homework_numbe
         Example: {"1": {"homework_pdf": "url1", "solution_pdf": "url2"}, "2": {...}}
     """
     all_pdf_links = {}
-    
-    for hw_number in homework_numbers:
-        hw_key = f"HW{int(hw_number):02d}"
-        pdf_links = fetch_homework_pdf_links(course_id, access_token, hw_number)
-        all_pdf_links[hw_key] = pdf_links
+    if not homework_numbers:
+        return all_pdf_links
+    
+    # list the Assignments subfolders once up front instead of re-paginating them per homework
+    homework_folder_ids = None
+    if course_id and access_token:
+        homework_folder_ids = fetch_homework_folder_ids(course_id, access_token)
+    
+    # each homework is a few round trips of its own, so fetch them side by side.
+    # map() keeps results in input order so the dict is built the same as before
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(homework_numbers))) as executor:
+        results = executor.map(
+            lambda hw_number: fetch_homework_pdf_links(course_id, access_token, hw_number, homework_folder_ids),
+            homework_numbers,
+        )
+        for hw_number, pdf_links in zip(homework_numbers, results):
+            hw_key = f"HW{int(hw_number):02d}"
+            all_pdf_links[hw_key] = pdf_links
     
     return all_pdf_links
 
@@ -231,28 +231,23 @@ def extract_homework_numbers_from_weeks_data(weeks_data: Dict) -> List[str]:
     """
     homework_numbers = set()
     
-    for week_num, week_data in weeks_data.items():
-        # Skip non-numeric keys like 'icon_urls'
-        if not str(week_num).isdigit():
-            continue
-            
+    # sorted_weeks already skips non-numeric keys like 'icon_urls' (and is cached per weeks_data)
+    for week_num, week_data in sorted_weeks(weeks_data):
         # Check each day of the week for homework assignments
-        for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]:
-            if day in week_data:
-                day_data = week_data[day]
-                
-                # Check assigned homework
-                assigned_text = day_data.get("assigned", "")
-                if assigned_text and "HW" in str(assigned_text).upper():
-                    hw_match = re.search(r'HW\s*(\d+)', str(assigned_text), re.IGNORECASE)
-                    if hw_match:
-                        homework_numbers.add(hw_match.group(1))
-                
-                # Check due homework
-                due_text = day_data.get("due", "")
-                if due_text and "HW" in str(due_text).upper():
-                    hw_match = re.search(r'HW\s*(\d+)', str(due_text), re.IGNORECASE)
-                    if hw_match:
-                        homework_numbers.add(hw_match.group(1))
+        for day, day_data in week_data.items():
+            if day not in _DAYS:
+                continue
+            
+            # Check assigned homework
+            assigned_text = day_data.get("assigned", "")
+            hw_match = HW_RE.search(assigned_text) if isinstance(assigned_text, str) else None
+            if hw_match:
+                homework_numbers.add(hw_match.group(1))
+            
+            # Check due homework
+            due_text = day_data.get("due", "")
+            hw_match = HW_RE.search(due_text) if isinstance(due_text, str) else None
+            if hw_match:
+                homework_numbers.add(hw_match.group(1))
     
     return sorted(list(homework_numbers), key=int)
@@ -1,42 +1,12 @@
 import requests
 from typing import Dict, Optional
+from files.backend.canvas_session import cache_folder_id, find_course_folder_id, get_json_page
 
 
+@cache_folder_id
 def fetch_course_information_folder_id(course_id: str, access_token: str) -> Optional[str]:
     """Fetch the 'Course Information' folder ID from Canvas."""
-    headers = {"Authorization": f"Bearer {access_token}"}
-    base_url = "https://umich.instructure.com/api/v1"
-    url = f"{base_url}/courses/{course_id}/folders"
-    
-    try:
-        while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            folders = response.json()
-            
-            # Look for "Course Information" folder
-            for folder in folders:
-                folder_name = folder.get("name", "")
-                if folder_name.lower() == "course information":
-                    return str(folder.get("id"))
-            
-            # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
-                    
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching folders: {e}")
-        return None
-    except Exception as e:
-        print(f"Error processing folders: {e}")
-        return None
-        
-    return None
+    return find_course_folder_id(course_id, access_token, "Course Information")
 
 
 def fetch_course_pdfs(course_id: str, access_token: str) -> Dict[str, str]:
@@ -64,10 +34,7 @@ def fetch_course_pdfs(course_id: str, access_token: str) -> Dict[str, str]:
     
     try:
         while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            files = response.json()
+            files, next_url = get_json_page(url, headers)
             
             # Process each file to find PDFs with the specified substrings
             for file_info in files:
@@ -92,12 +59,7 @@ def fetch_course_pdfs(course_id: str, access_token: str) -> Dict[str, str]:
                     print(f"Found syllabus PDF: {file_name} -> {preview_url}")
             
             # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
+            url = next_url
                     
     except requests.exceptions.RequestException as e:
         print(f"Error fetching files from Course Information folder: {e}")
@@ -1,17 +1,71 @@
+import copy
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
+from functools import lru_cache
+from openpyxl import load_workbook
 import yaml
-import numpy as np
 
 # Import utility functions from the new utils module
 from files.backend.populate_weeks_utils import (
+    WEEKDAY_ORDER,
     title_to_url_safe,
-    process_quiz_from_topic,
-    process_checkout_from_topic,
+    parse_topic_fields,
 )
 from files.backend.get_image_urls import get_image_urls_for_yaml_data
 from files.backend.quiz_utils import fetch_all_sample_quiz_folder_urls
 
+# strings pd.read_excel used to turn into NaN (and then ""), kept so cells read the same as before
+_NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+# strips everything but the digits out of a module cell like "Module 3"
+_NON_DIGITS_RE = re.compile(r"\D+")
+
+# libyaml's C loader when PyYAML was built with it, same results as safe_load just much faster
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# populate_weeks only reads columns 0-11 (up to the prework title); later ones like
+# "Notes to Self" are never converted, and short rows are padded so row[11] always exists
+_SCHEDULE_COLUMNS = 12
+
+
+def read_schedule_rows(excel_schedule_path: str) -> list:
+    """
+    Read the first sheet of the schedule workbook as plain row tuples.
+
+    Streams the sheet with openpyxl's read-only mode instead of building a DataFrame.
+    Rows line up with what pd.read_excel gave: the sheet's first row is treated as the header
+    and dropped, blank cells come back as "", and trailing empty rows are trimmed.
+
+    Args:
+        excel_schedule_path: Path to the schedule .xlsx file
+
+    Returns:
+        List of row tuples, one per sheet row after the header
+    """
+    wb = load_workbook(excel_schedule_path, read_only=True, data_only=True)
+    try:
+        # pd.read_excel defaulted to the first sheet, not the active one
+        ws = wb.worksheets[0]
+        rows = []
+        for values in ws.iter_rows(min_row=2, max_col=_SCHEDULE_COLUMNS, values_only=True):
+            row = tuple(
+                "" if value is None or (isinstance(value, str) and value in _NA_STRINGS) else value
+                for value in values
+            )
+            if len(row) < _SCHEDULE_COLUMNS:
+                row += ("",) * (_SCHEDULE_COLUMNS - len(row))
+            rows.append(row)
+    finally:
+        wb.close()
+
+    while rows and not any(value != "" for value in rows[-1]):
+        rows.pop()
+    return rows
+
 
 # populates the Week objects from the yaml and excel schedule files
 def populate_weeks(
@@ -24,81 +78,101 @@ def populate_weeks(
     lecture_info_path: str = "files/yaml/lecture_info.yaml"
 ):
     DATA_START_ROW = 1
-    df = pd.read_excel(excel_schedule_path, engine="openpyxl")
-    weeks_column = df.iloc[DATA_START_ROW:, 1].ffill().astype(int)
-    df = df.replace(np.nan, "")
+    rows = read_schedule_rows(excel_schedule_path)
+
+    # forward-fill the week number down column 1; weeks_column[index] lines up with rows[index]
+    weeks_column = [None] * DATA_START_ROW
+    current_week = None
+    for row in rows[DATA_START_ROW:]:
+        if row[1] != "":
+            current_week = int(row[1])
+        elif current_week is None:
+            raise ValueError("Schedule is missing the week number on its first data row")
+        weeks_column.append(current_week)
+    # plain ints in ascending order so consumers can iterate weeks without re-sorting
+    unique_weeks = sorted(set(weeks_column[DATA_START_ROW:]))
 
     overview_data, objective_data, images_data = read_overview_and_objective_yaml(overview_path, objectives_path, images_path)
     lecture_info = load_lecture_info(lecture_info_path)
 
-    image_urls, icon_urls = get_image_urls_for_yaml_data(images_data, course_id, access_token)
+    # the image lookup and the sample quiz lookup are independent Canvas round trips,
+    # so resolve the images on a worker while the quiz folders are fetched here
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        images_future = executor.submit(get_image_urls_for_yaml_data, images_data, course_id, access_token)
 
-    sample_quiz_urls = {}
-    if course_id and access_token:
-        print("Fetching sample quiz folder URLs from Canvas...")
-        sample_quiz_urls = fetch_all_sample_quiz_folder_urls(course_id, access_token)
-        print(f"Found {len(sample_quiz_urls)} sample quiz folder URLs")
+        sample_quiz_urls = {}
+        if course_id and access_token:
+            print("Fetching sample quiz folder URLs from Canvas...")
+            sample_quiz_urls = fetch_all_sample_quiz_folder_urls(course_id, access_token)
+            print(f"Found {len(sample_quiz_urls)} sample quiz folder URLs")
+
+        image_urls, icon_urls = images_future.result()
 
     weeks = {}
-    for w in set(weeks_column):
+    for w in unique_weeks:
         weeks[w] = {}
         weeks[w]["module"] = ""
         weeks[w]["overview_statement"] = overview_data[w]["description"]
         weeks[w]["image"] = image_urls[w]
 
-    for index, row in df.iterrows():
-        if index == 0:
-            continue
+    prev_wk = None
+    # row 0 is the sheet's column-title row; start past it instead of checking every iteration
+    for index, row in enumerate(rows[DATA_START_ROW:], start=DATA_START_ROW):
+        # the week dict this row belongs to, looked up once instead of on every field write
+        wk = weeks[weeks_column[index]]
 
         # handle module assignment for the week:
         # if the current row contains a module number, assign it.
         # otherwise, inherit the module from the previous week.
-        if "Mod" not in str(weeks[weeks_column[index]]["module"]) and str(row[2]) != "":
-            weeks[weeks_column[index]]["module"] = int("".join(c for c in row[2] if c.isdigit()))
-        elif str(row[2]) == "":
-            weeks[weeks_column[index]]["module"] = weeks[weeks_column[index - 1]]["module"]
+        module_cell = str(row[2])
+        if "Mod" not in str(wk["module"]) and module_cell != "":
+            wk["module"] = int(_NON_DIGITS_RE.sub("", module_cell))
+        elif module_cell == "":
+            wk["module"] = prev_wk["module"]
 
         # format the date from the excel file to MM/DD/YYYY
-        if isinstance(row[4], pd.Timestamp) or isinstance(row[4], datetime):
+        if isinstance(row[4], datetime):
             date_obj = row[4]
             formatted_date = date_obj.strftime("%m/%d/%Y")
-            weekday_names = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-            weekday = weekday_names[date_obj.weekday()]  # ex: "monday"
-
-            if weekday not in weeks[weeks_column[index]]:
-                weeks[weeks_column[index]][weekday] = {}
-
-            weeks[weeks_column[index]][weekday]["lesson"] = row[3]
-            weeks[weeks_column[index]][weekday]["date"] = formatted_date
-            weeks[weeks_column[index]][weekday]["topic"] = row[6]
-            weeks[weeks_column[index]][weekday]["referenced"] = row[7]
-            weeks[weeks_column[index]][weekday]["assigned"] = row[8]
-            weeks[weeks_column[index]][weekday]["due"] = row[9]
+            weekday = WEEKDAY_ORDER[date_obj.weekday()]  # ex: "monday"
+
+            day = wk.get(weekday)
+            if day is None:
+                day = wk[weekday] = {}
+
+            day["lesson"] = row[3]
+            day["date"] = formatted_date
+            day["topic"] = row[6]
+            day["referenced"] = row[7]
+            day["assigned"] = row[8]
+            day["due"] = row[9]
             
-            quiz_info = process_quiz_from_topic(row[6], sample_quiz_urls)
-            weeks[weeks_column[index]][weekday]["quiz_info"] = quiz_info
-            checkout_info = process_checkout_from_topic(row[6])
-            weeks[weeks_column[index]][weekday]["checkout_info"] = checkout_info
+            quiz_info, checkout_info = parse_topic_fields(row[6], sample_quiz_urls)
+            day["quiz_info"] = quiz_info
+            day["checkout_info"] = checkout_info
             
-            prework_title_raw = str(row[11]).strip() if not pd.isna(row[11]) else ""
+            prework_title_raw = str(row[11]).strip()
             if prework_title_raw and prework_title_raw != "":
-                current_module = weeks[weeks_column[index]]["module"]
+                current_module = wk["module"]
                 prework_title_with_prefix = f"Prework Module {current_module} - {prework_title_raw}"
-                weeks[weeks_column[index]][weekday]["prework_video_title"] = prework_title_with_prefix
+                day["prework_video_title"] = prework_title_with_prefix
                 url_safe_title = title_to_url_safe(prework_title_with_prefix)
                 if url_safe_title and course_id:
                     prework_link = f"https://umich.instructure.com/courses/{course_id}/pages/{url_safe_title}"
-                    weeks[weeks_column[index]][weekday]["prework_video_link"] = prework_link
+                    day["prework_video_link"] = prework_link
                 else:
-                    weeks[weeks_column[index]][weekday]["prework_video_link"] = ""
+                    day["prework_video_link"] = ""
             else:
-                weeks[weeks_column[index]][weekday]["prework_video_title"] = row[11]
-                weeks[weeks_column[index]][weekday]["prework_video_link"] = ""
+                day["prework_video_title"] = row[11]
+                day["prework_video_link"] = ""
 
         else:
             print(f"Warning: Row {index} has non-datetime value in date field: {row[4]}")
 
-    for w in set(weeks_column):
+        prev_wk = wk
+
+    # still a separate pass since each week's module is only known after the row loop
+    for w in unique_weeks:
         weeks[w]["learning_objectives"] = objective_data[weeks[w]["module"]]["learning_objectives"]
         weeks[w]["learning_objectives_topic"] = objective_data[weeks[w]["module"]]["learning_objectives_topic"]
 
@@ -110,30 +184,45 @@ def populate_weeks(
     
     return weeks
 
+@lru_cache(maxsize=100)
+def _parse_yaml(path: str, mtime: float, size: int):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def _shared_yaml(path: str):
+    # parsed once per (mtime, size) so an edited file is picked up on the next call.
+    # the result is shared between callers, so only hand it to code that just reads it
+    st = os.stat(path)
+    return _parse_yaml(path, st.st_mtime, st.st_size)
+
+
+def _cached_yaml(path: str):
+    # callers get their own copy, so mutating it can't leak into the cache
+    return copy.deepcopy(_shared_yaml(path))
+
+
 def read_overview_and_objective_yaml(
     overview_path: str,
     objectives_path: str,
     images_path: str
 ):
-    overview_data = {}
-    objective_data = {}
-    images_data = {}
-
-    with open(overview_path, "r", encoding="utf-8") as f:
-        overview_data = yaml.safe_load(f)
-    with open(objectives_path, "r", encoding="utf-8") as f:
-        objective_data = yaml.safe_load(f)
-    with open(images_path, "r", encoding="utf-8") as f:
-        images_data = yaml.safe_load(f)
+    overview_data = _cached_yaml(overview_path)
+    objective_data = _cached_yaml(objectives_path)
+    images_data = _cached_yaml(images_path)
 
     return (overview_data, objective_data, images_data)
 
 
 def load_lecture_info(lecture_info_path: str = "files/yaml/lecture_info.yaml"):
     """Load lecture information from YAML file."""
-    with open(lecture_info_path, "r", encoding="utf-8") as f:
-        lecture_info = yaml.safe_load(f)
-    return lecture_info
+    return _cached_yaml(lecture_info_path)
+
+
+def load_learning_objectives(objectives_path: str = "files/yaml/learning_objectives.yaml"):
+    """Load learning objectives from YAML file (a shared cached copy, so only read it)."""
+    # the quiz and checkout builders only .get() each module's entry, so no defensive copy
+    return _shared_yaml(objectives_path) or {}
 
 
 def get_lecture_days_list(lecture_info_path: str = "files/yaml/lecture_info.yaml"):
@@ -142,7 +231,8 @@ def get_lecture_days_list(lecture_info_path: str = "files/yaml/lecture_info.yaml
     Default: ['monday', 'wednesday', 'friday']
     """
     try:
-        lecture_info = load_lecture_info(lecture_info_path)
+        # read-only use, so skip the defensive copy load_lecture_info makes
+        lecture_info = _shared_yaml(lecture_info_path)
         days_string = lecture_info.get("lecture_days", "Monday, Wednesday, & Friday")
         
         # Parse the days string to extract individual days
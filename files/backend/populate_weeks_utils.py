@@ -1,23 +1,39 @@
 import re
 import requests
-import pandas as pd
-from typing import Optional, Dict, List
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
+from files.backend.canvas_session import SESSION, TIMEOUT, next_page_url, parse_json
 
+# "Quiz 3" / "Checkout 2" anywhere in a topic cell, matched in a single pass
+_TOPIC_ITEM_RE = re.compile(r"(Quiz|Checkout)\s*(\d+)", re.IGNORECASE)
+# compiled once instead of going through re's pattern cache on every call
+_QUIZ_RE = re.compile(r"Quiz\s*(\d+)", re.IGNORECASE)
+# "HW 3" in an assigned/due cell; every module that pulls homework numbers out of cells uses this one
+HW_RE = re.compile(r"HW\s*(\d+)", re.IGNORECASE)
 
+# days in datetime.weekday() order; the one copy every module walks week days with
+WEEKDAY_ORDER = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# like _TOPIC_ITEM_RE, but a bare "Quiz"/"Checkout" with no number matches too
+_TOPIC_WORD_RE = re.compile(r"(Quiz|Checkout)\s*(\d+)?", re.IGNORECASE)
+
+# "/" -> "-slash-", apostrophes dropped, "&" -> "and", all in a single translate pass
+_URL_SAFE_TABLE = str.maketrans({"/": "-slash-", "'": None, "&": "and"})
+# hyphens are themselves non-alphanumeric, so one run-collapsing pass also squashes "--"
+_URL_UNSAFE_RE = re.compile(r"[^a-z0-9]+")
+
+
+# pure string transform called for the same titles over and over while building and uploading
+@lru_cache(maxsize=512)
 def title_to_url_safe(title: str) -> str:
-    if not title or pd.isna(title) or str(title).strip() == "":
+    # title != title is only true for NaN; whitespace-only titles come out "" from the sub below
+    if not title or title != title:
         return ""
-    url_safe = str(title).lower()
-    # Replace forward slashes with "-slash-" first
-    url_safe = url_safe.replace("/", "-slash-")
-    # Remove apostrophes completely
-    url_safe = url_safe.replace("'", "")
-    # Replace ampersand with "and"
-    url_safe = url_safe.replace("&", "and")
+    # Replace forward slashes with "-slash-", remove apostrophes and spell out ampersands
+    url_safe = str(title).lower().translate(_URL_SAFE_TABLE)
     # Then replace all other non-alphanumeric characters with hyphens
-    url_safe = re.sub(r"[^a-z0-9]+", "-", url_safe)
-    url_safe = re.sub(r"-+", "-", url_safe)
-    url_safe = url_safe.strip("-")
+    url_safe = _URL_UNSAFE_RE.sub("-", url_safe).strip("-")
 
     return url_safe
 
@@ -46,17 +62,7 @@ def get_week_title_with_topic_and_date(weeks_data: Dict, display_week_num: int)
     topic = ""
     earliest_date = ""
 
-    weekday_order = [
-        "monday",
-        "tuesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    ]
-
-    for weekday in weekday_order:
+    for weekday in WEEKDAY_ORDER:
         if weekday in week_data:
             day_data = week_data[weekday]
 
@@ -98,17 +104,7 @@ def find_quiz_or_checkout_in_week(week_data: Dict) -> str:
     Returns:
         Formatted string with quiz/checkout info or empty string if none found
     """
-    weekday_order = [
-        "monday",
-        "tuesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    ]
-
-    for weekday in weekday_order:
+    for weekday in WEEKDAY_ORDER:
         if weekday in week_data:
             day_data = week_data[weekday]
             topic = day_data.get("topic", "")
@@ -116,31 +112,27 @@ def find_quiz_or_checkout_in_week(week_data: Dict) -> str:
             if not topic:
                 continue
 
-            topic_str = str(topic).strip().upper()
-
-            # Check for QUIZ
-            if "QUIZ" in topic_str:
-                # Extract quiz number
-                import re
-
-                quiz_match = re.search(r"QUIZ\s*(\d+)", topic_str)
-                if quiz_match:
-                    quiz_number = quiz_match.group(1)
-                    return f"Quiz {quiz_number}"
+            quiz_seen = checkout_seen = False
+            checkout_number = None
+            # one case-insensitive pass over the topic, no upper()'d copy. a quiz anywhere in
+            # the topic outranks a checkout, and a numbered mention outranks a bare one
+            for match in _TOPIC_WORD_RE.finditer(str(topic)):
+                number = match.group(2)
+                if match.group(1)[0] in "qQ":
+                    if number:
+                        return f"Quiz {number}"
+                    quiz_seen = True
                 else:
-                    return "Quiz"
-
-            # Check for CHECKOUT
-            elif "CHECKOUT" in topic_str:
-                # Extract checkout number
-                import re
+                    checkout_seen = True
+                    if number and checkout_number is None:
+                        checkout_number = number
 
-                checkout_match = re.search(r"CHECKOUT\s*(\d+)", topic_str)
-                if checkout_match:
-                    checkout_number = checkout_match.group(1)
-                    return f"Checkout {checkout_number}"
-                else:
-                    return "Checkout"
+            if quiz_seen:
+                return "Quiz"
+            if checkout_number:
+                return f"Checkout {checkout_number}"
+            if checkout_seen:
+                return "Checkout"
 
     return ""
 
@@ -154,14 +146,17 @@ def fetch_canvas_pages(course_id: str, access_token: str) -> Dict[str, str]:
 
     headers = {"Authorization": f"Bearer {access_token}"}
     base_url = "https://umich.instructure.com/api/v1"
-    url = f"{base_url}/courses/{course_id}/pages"
+    # 100 per page (Canvas's max) so most courses' pages come back in a single request
+    url = f"{base_url}/courses/{course_id}/pages?per_page=100"
 
     try:
         while url:
-            response = requests.get(url, headers=headers)
+            # the shared pooled session keeps the connection alive from one page to the next
+            response = SESSION.get(url, headers=headers, timeout=TIMEOUT)
             response.raise_for_status()
 
-            pages = response.json()
+            # orjson straight from the body bytes when it's installed
+            pages = parse_json(response)
 
             # Process each page to find quiz pages
             for page in pages:
@@ -169,8 +164,7 @@ def fetch_canvas_pages(course_id: str, access_token: str) -> Dict[str, str]:
                 page_url = page.get("url", "")
 
                 # Look for "Quiz#" or "Quiz #" pattern in page titles (case-insensitive)
-                quiz_pattern = r"Quiz\s*(\d+)"
-                match = re.search(quiz_pattern, title, re.IGNORECASE)
+                match = _QUIZ_RE.search(title)
 
                 if match:
                     quiz_number = match.group(1)
@@ -180,12 +174,7 @@ def fetch_canvas_pages(course_id: str, access_token: str) -> Dict[str, str]:
                     print(f"Found sample quiz page: Quiz {quiz_number} -> {title}")
 
             # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
+            url = next_page_url(response.headers.get("Link", ""))
 
     except requests.exceptions.RequestException as e:
         print(f"Warning: Failed to fetch Canvas pages: {e}")
@@ -195,9 +184,20 @@ def fetch_canvas_pages(course_id: str, access_token: str) -> Dict[str, str]:
     return quiz_pages
 
 
-def process_quiz_from_topic(
+def parse_topic_fields(
     topic: str, sample_quiz_urls: Optional[Dict[str, str]] = None
-) -> dict:
+) -> Tuple[dict, dict]:
+    """
+    Extract both the quiz and checkout information from a topic string in one scan.
+
+    Args:
+        topic: Topic cell from the schedule
+        sample_quiz_urls: Optional mapping of quiz number to sample quiz folder URL
+
+    Returns:
+        (quiz_info, checkout_info) dicts, shaped like process_quiz_from_topic and
+        process_checkout_from_topic return them
+    """
     quiz_info = {
         "has_quiz": False,
         "quiz_number": "",
@@ -205,28 +205,46 @@ def process_quiz_from_topic(
         "sample_text": "",
         "sample_quiz_url": "",
     }
+    checkout_info = {
+        "has_checkout": False,
+        "checkout_number": "",
+    }
 
-    if not topic or pd.isna(topic):
-        return quiz_info
+    # topic != topic catches a NaN cell without going through pd.isna
+    if not topic or topic != topic:
+        return quiz_info, checkout_info
 
     topic_str = str(topic).strip()
 
-    # Look for "Quiz" followed by optional space and a number
-    quiz_pattern = r"Quiz\s*(\d+)"
-    match = re.search(quiz_pattern, topic_str, re.IGNORECASE)
+    # "Quiz N" and "Checkout N" can't overlap, so the first match of each kind here is the same
+    # one a separate search for that pattern would find
+    for match in _TOPIC_ITEM_RE.finditer(topic_str):
+        number = match.group(2)
+        if match.group(1)[0] in "qQ":
+            if quiz_info["has_quiz"]:
+                continue
+            quiz_info["has_quiz"] = True
+            quiz_info["quiz_number"] = number
+            quiz_info["study_text"] = f"Study for Quiz {number}"
+            quiz_info["sample_text"] = f"Sample Quiz {number}"
+
+            # Add sample quiz URL if available
+            if sample_quiz_urls and number in sample_quiz_urls:
+                quiz_info["sample_quiz_url"] = sample_quiz_urls[number]
+        elif not checkout_info["has_checkout"]:
+            checkout_info["has_checkout"] = True
+            checkout_info["checkout_number"] = number
+
+        if quiz_info["has_quiz"] and checkout_info["has_checkout"]:
+            break
 
-    if match:
-        quiz_number = match.group(1)
-        quiz_info["has_quiz"] = True
-        quiz_info["quiz_number"] = quiz_number
-        quiz_info["study_text"] = f"Study for Quiz {quiz_number}"
-        quiz_info["sample_text"] = f"Sample Quiz {quiz_number}"
+    return quiz_info, checkout_info
 
-        # Add sample quiz URL if available
-        if sample_quiz_urls and quiz_number in sample_quiz_urls:
-            quiz_info["sample_quiz_url"] = sample_quiz_urls[quiz_number]
 
-    return quiz_info
+def process_quiz_from_topic(
+    topic: str, sample_quiz_urls: Optional[Dict[str, str]] = None
+) -> dict:
+    return parse_topic_fields(topic, sample_quiz_urls)[0]
 
 
 def process_checkout_from_topic(topic: str) -> dict:
@@ -234,25 +252,43 @@ def process_checkout_from_topic(topic: str) -> dict:
     Extract checkout information from a topic string.
     Returns a dict with keys: has_checkout (bool) and checkout_number (str).
     """
-    checkout_info = {
-        "has_checkout": False,
-        "checkout_number": "",
-    }
-    if not topic or pd.isna(topic):
-        return checkout_info
+    return parse_topic_fields(topic)[1]
 
-    topic_str = str(topic).strip()
 
-    # Look for "Checkout" followed by optional space and a number
-    checkout_pattern = r"Checkout\s*(\d+)"
-    match = re.search(checkout_pattern, topic_str, re.IGNORECASE)
+@lru_cache(maxsize=512)
+def parse_schedule_date(date_str: str) -> Optional[datetime]:
+    """
+    Parse an MM/DD/YYYY schedule date, caching the result.
+
+    Args:
+        date_str: Date string from the schedule
+
+    Returns:
+        The parsed datetime, or None if the string is empty or not a valid date
+    """
+    # the same handful of dates get compared on every render, and strptime is slow
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str, "%m/%d/%Y")
+    except ValueError:
+        return None
+
 
-    if match:
-        checkout_number = match.group(1)
-        checkout_info["has_checkout"] = True
-        checkout_info["checkout_number"] = checkout_number
+class WeeksHandle:
+    """Hashes a weeks_data dict by identity so per-week lookups over it can be memoized."""
 
-    return checkout_info
+    __slots__ = ("weeks_data",)
+
+    def __init__(self, weeks_data: Dict):
+        # holding the dict keeps it alive while cached, so its id can't be reused by another one
+        self.weeks_data = weeks_data
+
+    def __hash__(self) -> int:
+        return id(self.weeks_data)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, WeeksHandle) and other.weeks_data is self.weeks_data
 
 
 def collect_quiz_dates(weeks_data: Dict) -> List[Dict]:
@@ -266,13 +302,21 @@ def collect_quiz_dates(weeks_data: Dict) -> List[Dict]:
         List of quiz dictionaries with quiz_number, date, and week_number
         sorted by date
     """
+    return _collect_quiz_dates(WeeksHandle(weeks_data))
+
+
+@lru_cache(maxsize=16)
+def _collect_quiz_dates(handle: WeeksHandle) -> List[Dict]:
+    # the builders and every find_next_quiz call walk the same weeks, so only do it once
+    weeks_data = handle.weeks_data
     quizzes = []
 
+    from files.backend.populate_weeks import get_lecture_days_list
+
+    # same lecture days for every week, so look them up once
+    lecture_days = get_lecture_days_list()
     for week_num, week_data in weeks_data.items():
         # Check each lecture day for quizzes
-        from files.backend.populate_weeks import get_lecture_days_list
-
-        lecture_days = get_lecture_days_list()
         for day in lecture_days:
             if day in week_data:
                 day_data = week_data[day]
@@ -297,6 +341,59 @@ def collect_quiz_dates(weeks_data: Dict) -> List[Dict]:
     return quizzes
 
 
+def clear_week_lookup_caches() -> None:
+    """Drop memoized next-quiz/next-checkout/homework lookups, e.g. before building a new upload."""
+    _find_next_quiz.cache_clear()
+    _find_next_checkout.cache_clear()
+    _week_start_date.cache_clear()
+    _collect_homework_assignments_opening_during_week.cache_clear()
+    _collect_homework_assignments_due_during_week.cache_clear()
+    _find_homework_due_date_across_weeks.cache_clear()
+    _find_homework_assigned_date_across_weeks.cache_clear()
+    _collect_quiz_dates.cache_clear()
+    _sorted_weeks.cache_clear()
+
+    from files.backend.checkout_utils import _collect_checkout_assignments
+    from files.backend.quiz_utils import _get_homework_range_for_module
+
+    _collect_checkout_assignments.cache_clear()
+    _get_homework_range_for_module.cache_clear()
+
+
+def sorted_weeks(weeks_data: Dict) -> List[Tuple[int, Dict]]:
+    """
+    Get the (week number, week data) pairs of weeks_data in week order.
+
+    Args:
+        weeks_data: Dictionary containing all weeks data
+
+    Returns:
+        List of (week number, week data) tuples, skipping string keys like 'icon_urls'
+    """
+    return _sorted_weeks(WeeksHandle(weeks_data))
+
+
+@lru_cache(maxsize=16)
+def _sorted_weeks(handle: WeeksHandle) -> List[Tuple[int, Dict]]:
+    # week keys are ints and everything else is a string, so no int()/isdigit() per key
+    return sorted(
+        (k, v) for k, v in handle.weeks_data.items() if not isinstance(k, str)
+    )
+
+
+@lru_cache(maxsize=256)
+def _week_start_date(handle: WeeksHandle, week_num: int) -> Optional[datetime]:
+    # earliest lecture-day date of the week, parsed; next-quiz and next-checkout share this
+    from files.backend.populate_weeks import get_lecture_days_list
+
+    week_data = handle.weeks_data.get(week_num, {})
+    for day in get_lecture_days_list():
+        if day in week_data and week_data[day].get("date"):
+            # an unparseable first date means no reference date, same as a missing one
+            return parse_schedule_date(week_data[day]["date"])
+    return None
+
+
 def find_next_quiz(weeks_data: Dict, current_week_num: int) -> Optional[Dict]:
     """
     Find the next upcoming quiz based on the current week.
@@ -308,45 +405,27 @@ def find_next_quiz(weeks_data: Dict, current_week_num: int) -> Optional[Dict]:
     Returns:
         Dictionary with next quiz info or None if no upcoming quiz
     """
-    from datetime import datetime
+    return _find_next_quiz(WeeksHandle(weeks_data), current_week_num)
 
-    all_quizzes = collect_quiz_dates(weeks_data)
+
+@lru_cache(maxsize=256)
+def _find_next_quiz(handle: WeeksHandle, current_week_num: int) -> Optional[Dict]:
+    all_quizzes = collect_quiz_dates(handle.weeks_data)
 
     if not all_quizzes:
         return None
 
     # Get current week's date to determine what has passed
-    current_date = None
-    current_week_data = weeks_data.get(current_week_num, {})
-
-    # Find the earliest date in the current week as reference
-    from files.backend.populate_weeks import get_lecture_days_list
-
-    lecture_days = get_lecture_days_list()
-    for day in lecture_days:
-        if day in current_week_data and current_week_data[day].get("date"):
-            current_date = current_week_data[day]["date"]
-            break
-
-    if not current_date:
-        # If no current date found, return the first quiz
-        return all_quizzes[0] if all_quizzes else None
-
-    # Parse current date
-    try:
-        current_date_obj = datetime.strptime(current_date, "%m/%d/%Y")
-    except ValueError:
-        # If parsing fails, return the first quiz
+    current_date_obj = _week_start_date(handle, current_week_num)
+    if current_date_obj is None:
+        # If no usable current date found, return the first quiz
         return all_quizzes[0] if all_quizzes else None
 
     # Find the next quiz that hasn't passed yet
     for quiz in all_quizzes:
-        try:
-            quiz_date_obj = datetime.strptime(quiz["date"], "%m/%d/%Y")
-            if quiz_date_obj >= current_date_obj:
-                return quiz
-        except ValueError:
-            continue
+        quiz_date_obj = parse_schedule_date(quiz["date"])
+        if quiz_date_obj is not None and quiz_date_obj >= current_date_obj:
+            return quiz
 
     # If all quizzes have passed, return None
     return None
@@ -363,46 +442,29 @@ def find_next_checkout(weeks_data: Dict, current_week_num: int) -> Optional[Dict
     Returns:
         Dictionary with next checkout info or None if no upcoming checkout
     """
-    from datetime import datetime
+    return _find_next_checkout(WeeksHandle(weeks_data), current_week_num)
+
+
+@lru_cache(maxsize=256)
+def _find_next_checkout(handle: WeeksHandle, current_week_num: int) -> Optional[Dict]:
     from files.backend.checkout_utils import collect_checkout_assignments
 
-    all_checkouts = collect_checkout_assignments(weeks_data)
+    all_checkouts = collect_checkout_assignments(handle.weeks_data)
 
     if not all_checkouts:
         return None
 
     # Get current week's date to determine what has passed
-    current_date = None
-    current_week_data = weeks_data.get(current_week_num, {})
-
-    # Find the earliest date in the current week as reference
-    from files.backend.populate_weeks import get_lecture_days_list
-
-    lecture_days = get_lecture_days_list()
-    for day in lecture_days:
-        if day in current_week_data and current_week_data[day].get("date"):
-            current_date = current_week_data[day]["date"]
-            break
-
-    if not current_date:
-        # If no current date found, return the first checkout
-        return all_checkouts[0] if all_checkouts else None
-
-    # Parse current date
-    try:
-        current_date_obj = datetime.strptime(current_date, "%m/%d/%Y")
-    except ValueError:
-        # If parsing fails, return the first checkout
+    current_date_obj = _week_start_date(handle, current_week_num)
+    if current_date_obj is None:
+        # If no usable current date found, return the first checkout
         return all_checkouts[0] if all_checkouts else None
 
     # Find the next checkout that hasn't passed yet
     for checkout in all_checkouts:
-        try:
-            checkout_date_obj = datetime.strptime(checkout["date"], "%m/%d/%Y")
-            if checkout_date_obj >= current_date_obj:
-                return checkout
-        except ValueError:
-            continue
+        checkout_date_obj = parse_schedule_date(checkout["date"])
+        if checkout_date_obj is not None and checkout_date_obj >= current_date_obj:
+            return checkout
 
     # If all checkouts have passed, return None
     return None
@@ -421,6 +483,14 @@ def collect_homework_assignments_opening_during_week(
     Returns:
         List of homework dictionaries with homework_number, assigned_date, due_date, day
     """
+    return _collect_homework_assignments_opening_during_week(WeeksHandle(weeks_data), current_week_num)
+
+
+@lru_cache(maxsize=256)
+def _collect_homework_assignments_opening_during_week(
+    handle: WeeksHandle, current_week_num: int
+) -> List[Dict]:
+    weeks_data = handle.weeks_data
     if current_week_num not in weeks_data:
         return []
 
@@ -428,22 +498,14 @@ def collect_homework_assignments_opening_during_week(
     homework_opening = []
 
     # Check each day of the week for homework assignments being opened
-    for day in [
-        "monday",
-        "tuesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    ]:
+    for day in WEEKDAY_ORDER:
         if day in week_data:
             day_data = week_data[day]
             assigned_text = day_data.get("assigned", "")
 
-            if assigned_text and "HW" in str(assigned_text).upper():
-                # Extract homework number using regex
-                hw_match = re.search(r"HW\s*(\d+)", str(assigned_text), re.IGNORECASE)
+            if assigned_text:
+                # one case-insensitive search, no upper()'d copy to prefilter on
+                hw_match = HW_RE.search(str(assigned_text))
                 if hw_match:
                     hw_number = hw_match.group(1)
 
@@ -479,6 +541,14 @@ def collect_homework_assignments_due_during_week(
     Returns:
         List of homework dictionaries with homework_number, due_date, assigned_date, day
     """
+    return _collect_homework_assignments_due_during_week(WeeksHandle(weeks_data), current_week_num)
+
+
+@lru_cache(maxsize=256)
+def _collect_homework_assignments_due_during_week(
+    handle: WeeksHandle, current_week_num: int
+) -> List[Dict]:
+    weeks_data = handle.weeks_data
     if current_week_num not in weeks_data:
         return []
 
@@ -486,22 +556,14 @@ def collect_homework_assignments_due_during_week(
     homework_due = []
 
     # Check each day of the week for homework assignments due
-    for day in [
-        "monday",
-        "tuesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    ]:
+    for day in WEEKDAY_ORDER:
         if day in week_data:
             day_data = week_data[day]
             due_text = day_data.get("due", "")
 
-            if due_text and "HW" in str(due_text).upper():
-                # Extract homework number using regex
-                hw_match = re.search(r"HW\s*(\d+)", str(due_text), re.IGNORECASE)
+            if due_text:
+                # one case-insensitive search, no upper()'d copy to prefilter on
+                hw_match = HW_RE.search(str(due_text))
                 if hw_match:
                     hw_number = hw_match.group(1)
 
@@ -526,20 +588,19 @@ def collect_homework_assignments_due_during_week(
 
 def find_homework_due_date_across_weeks(weeks_data: Dict, hw_number: str) -> str:
     """Find the due date for a specific homework number across all weeks."""
+    return _find_homework_due_date_across_weeks(WeeksHandle(weeks_data), hw_number)
+
+
+@lru_cache(maxsize=256)
+def _find_homework_due_date_across_weeks(handle: WeeksHandle, hw_number: str) -> str:
+    # every week that mentions a homework asks again, so each (weeks_data, hw) scan runs once
+    weeks_data = handle.weeks_data
     for week_num, week_data in weeks_data.items():
         # Skip non-numeric keys like 'icon_urls'
         if not str(week_num).isdigit():
             continue
 
-        for day in [
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        ]:
+        for day in WEEKDAY_ORDER:
             if day in week_data and "due" in week_data[day]:
                 due_text = week_data[day]["due"]
                 if due_text and hw_number in str(due_text):
@@ -550,20 +611,19 @@ def find_homework_due_date_across_weeks(weeks_data: Dict, hw_number: str) -> str
 
 def find_homework_assigned_date_across_weeks(weeks_data: Dict, hw_number: str) -> str:
     """Find the assigned date for a specific homework number across all weeks."""
+    return _find_homework_assigned_date_across_weeks(WeeksHandle(weeks_data), hw_number)
+
+
+@lru_cache(maxsize=256)
+def _find_homework_assigned_date_across_weeks(handle: WeeksHandle, hw_number: str) -> str:
+    # every week that mentions a homework asks again, so each (weeks_data, hw) scan runs once
+    weeks_data = handle.weeks_data
     for week_num, week_data in weeks_data.items():
         # Skip non-numeric keys like 'icon_urls'
         if not str(week_num).isdigit():
             continue
 
-        for day in [
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        ]:
+        for day in WEEKDAY_ORDER:
             if day in week_data and "assigned" in week_data[day]:
                 assigned_text = week_data[day]["assigned"]
                 if assigned_text and hw_number in str(assigned_text):
@@ -587,47 +647,22 @@ def get_week_days_in_order(week_data: Dict) -> List[Dict]:
         - date: the formatted date string
         - data: the full day data dictionary
     """
-    from datetime import datetime
-    
-    weekday_order = [
-        "monday",
-        "tuesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    ]
     
     days_found = []
     
-    for day_name in weekday_order:
+    for day_name in WEEKDAY_ORDER:
         if day_name in week_data and isinstance(week_data[day_name], dict):
             day_data = week_data[day_name]
-            date_str = day_data.get("date", "")
-            
-            # Parse the date for sorting
-            date_obj = None
-            if date_str:
-                try:
-                    date_obj = datetime.strptime(date_str, "%m/%d/%Y")
-                except ValueError:
-                    pass
             
             days_found.append({
                 "day_name": day_name,
                 "display_name": day_name.capitalize(),
-                "date": date_str,
-                "date_obj": date_obj,
+                "date": day_data.get("date", ""),
                 "data": day_data,
             })
     
-    # Sort by date object (None values go to end)
-    days_found.sort(key=lambda x: x["date_obj"] if x["date_obj"] else datetime.max)
-    
-    # Remove the date_obj from the output (it was only for sorting)
-    for day in days_found:
-        del day["date_obj"]
+    # Sort by date (missing or unparseable dates go to the end)
+    days_found.sort(key=lambda x: parse_schedule_date(x["date"]) or datetime.max)
     
     return days_found
 
@@ -1,7 +1,11 @@
+import os
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
 import re
 import requests
 from urllib.parse import quote
+from files.backend.canvas_session import cache_folder_id, find_course_folder_id, get_json_page
+from files.backend.populate_weeks_utils import HW_RE, WEEKDAY_ORDER, WeeksHandle, parse_schedule_date
 
 
 def get_lesson_range_for_module(weeks_data: Dict, module_number: int) -> str:
@@ -16,93 +20,11 @@ def get_lesson_range_for_module(weeks_data: Dict, module_number: int) -> str:
     Returns:
         String representing the lesson range (e.g., "1A-1D")
     """
-    # We need to re-read the Excel file to get the raw row-by-row data
-    # and detect module transitions
+    # We need the raw row-by-row Excel data to detect module transitions
     try:
-        import pandas as pd
-        import numpy as np
-        
-        # Re-read the Excel file (assuming it's in the standard location)
+        # Assuming the Excel file is in the standard location
         excel_path = "files/yaml/schedule.xlsx"
-        df = pd.read_excel(excel_path, engine="openpyxl")
-        df = df.replace(np.nan, "")
-        
-        # Find lesson ranges by detecting module transitions
-        module_ranges = {}
-        current_module = None
-        start_lesson = None
-        
-
-        
-        for index, row in df.iterrows():
-            if index == 0:  # Skip header row
-                continue
-                
-            # Column C contains module info (index 2)
-            module_cell = str(row.iloc[2]).strip()
-            lesson_cell = str(row.iloc[3]).strip()
-            
-            # Extract module number from module cell
-            extracted_module = None
-            if module_cell:
-                import re
-                # Look for patterns like "Module 1", "Mod. 2", "Mod 3", etc.
-                match = re.search(r'(?:Module?\.?\s*)?(\d+)', module_cell, re.IGNORECASE)
-                if match:
-                    extracted_module = int(match.group(1))
-            
-            # If we found a valid lesson and it's not a placeholder
-            if lesson_cell and lesson_cell != "-":
-                
-                # If this is the start or we detected a module change
-                if current_module is None or (extracted_module and extracted_module != current_module):
-                    
-                    # If we had a previous module, finalize its range
-                    if current_module is not None and start_lesson:
-                        # The previous row had the end lesson for the previous module
-                        prev_index = index - 1
-                        if prev_index > 0:
-                            prev_lesson = str(df.iloc[prev_index, 3]).strip()
-                            if prev_lesson and prev_lesson != "-":
-                                end_lesson = prev_lesson
-                            else:
-                                # Find the last valid lesson before this
-                                end_lesson = start_lesson
-                                for back_idx in range(prev_index, 0, -1):
-                                    back_lesson = str(df.iloc[back_idx, 3]).strip()
-                                    if back_lesson and back_lesson != "-":
-                                        end_lesson = back_lesson
-                                        break
-                        else:
-                            end_lesson = start_lesson
-                            
-                        if start_lesson == end_lesson:
-                            module_ranges[current_module] = start_lesson
-                        else:
-                            module_ranges[current_module] = f"{start_lesson}-{end_lesson}"
-                    
-                    # Start tracking the new module
-                    if extracted_module:
-                        current_module = extracted_module
-                        start_lesson = lesson_cell
-                
-                # If we're in a module but no module transition, just continue
-                # (we'll use the lesson as potential end lesson)
-        
-        # Handle the last module
-        if current_module is not None and start_lesson:
-            # Find the last lesson in the dataset
-            end_lesson = start_lesson
-            for back_idx in range(len(df) - 1, 0, -1):
-                back_lesson = str(df.iloc[back_idx, 3]).strip()
-                if back_lesson and back_lesson != "-":
-                    end_lesson = back_lesson
-                    break
-                    
-            if start_lesson == end_lesson:
-                module_ranges[current_module] = start_lesson
-            else:
-                module_ranges[current_module] = f"{start_lesson}-{end_lesson}"
+        module_ranges = _lesson_ranges_from_schedule(excel_path, os.path.getmtime(excel_path))
         
         # Return the range for the requested module
         if module_number in module_ranges:
@@ -115,6 +37,94 @@ def get_lesson_range_for_module(weeks_data: Dict, module_number: int) -> str:
         return f"{module_number}A-{module_number}D"  # Fallback
 
 
+# every module's range comes out of the same pass over the spreadsheet, so read and scan it
+# once per file version instead of once per quiz
+@lru_cache(maxsize=4)
+def _lesson_ranges_from_schedule(excel_path: str, mtime: float) -> Dict[int, str]:
+    import pandas as pd
+    import numpy as np
+    
+    df = pd.read_excel(excel_path, engine="openpyxl")
+    df = df.replace(np.nan, "")
+    
+    # Find lesson ranges by detecting module transitions
+    module_ranges = {}
+    current_module = None
+    start_lesson = None
+    
+    for index, row in df.iterrows():
+        if index == 0:  # Skip header row
+            continue
+            
+        # Column C contains module info (index 2)
+        module_cell = str(row.iloc[2]).strip()
+        lesson_cell = str(row.iloc[3]).strip()
+        
+        # Extract module number from module cell
+        extracted_module = None
+        if module_cell:
+            import re
+            # Look for patterns like "Module 1", "Mod. 2", "Mod 3", etc.
+            match = re.search(r'(?:Module?\.?\s*)?(\d+)', module_cell, re.IGNORECASE)
+            if match:
+                extracted_module = int(match.group(1))
+        
+        # If we found a valid lesson and it's not a placeholder
+        if lesson_cell and lesson_cell != "-":
+            
+            # If this is the start or we detected a module change
+            if current_module is None or (extracted_module and extracted_module != current_module):
+                
+                # If we had a previous module, finalize its range
+                if current_module is not None and start_lesson:
+                    # The previous row had the end lesson for the previous module
+                    prev_index = index - 1
+                    if prev_index > 0:
+                        prev_lesson = str(df.iloc[prev_index, 3]).strip()
+                        if prev_lesson and prev_lesson != "-":
+                            end_lesson = prev_lesson
+                        else:
+                            # Find the last valid lesson before this
+                            end_lesson = start_lesson
+                            for back_idx in range(prev_index, 0, -1):
+                                back_lesson = str(df.iloc[back_idx, 3]).strip()
+                                if back_lesson and back_lesson != "-":
+                                    end_lesson = back_lesson
+                                    break
+                    else:
+                        end_lesson = start_lesson
+                        
+                    if start_lesson == end_lesson:
+                        module_ranges[current_module] = start_lesson
+                    else:
+                        module_ranges[current_module] = f"{start_lesson}-{end_lesson}"
+                
+                # Start tracking the new module
+                if extracted_module:
+                    current_module = extracted_module
+                    start_lesson = lesson_cell
+            
+            # If we're in a module but no module transition, just continue
+            # (we'll use the lesson as potential end lesson)
+    
+    # Handle the last module
+    if current_module is not None and start_lesson:
+        # Find the last lesson in the dataset
+        end_lesson = start_lesson
+        for back_idx in range(len(df) - 1, 0, -1):
+            back_lesson = str(df.iloc[back_idx, 3]).strip()
+            if back_lesson and back_lesson != "-":
+                end_lesson = back_lesson
+                break
+                
+        if start_lesson == end_lesson:
+            module_ranges[current_module] = start_lesson
+        else:
+            module_ranges[current_module] = f"{start_lesson}-{end_lesson}"
+    
+    return module_ranges
+
+
 def get_homework_range_for_module(weeks_data: Dict, module_number: int) -> str:
     """
     Calculate the homework range for a given module (e.g., "Homeworks 1 & 2").
@@ -126,25 +136,31 @@ def get_homework_range_for_module(weeks_data: Dict, module_number: int) -> str:
     Returns:
         String representing the homework range (e.g., "Homeworks 1 & 2")
     """
+    return _get_homework_range_for_module(WeeksHandle(weeks_data), module_number)
+
+
+@lru_cache(maxsize=32)
+def _get_homework_range_for_module(handle: WeeksHandle, module_number: int) -> str:
+    weeks_data = handle.weeks_data
     homework_numbers = []
     
     for week_num, week_data in weeks_data.items():
         if week_data.get("module") == module_number:
             # Check each day for homework assignments
-            for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]:
+            for day in WEEKDAY_ORDER:
                 if day in week_data:
                     assigned = week_data[day].get("assigned", "")
                     due = week_data[day].get("due", "")
                     
                     # Check assigned homework
-                    if assigned and "HW" in str(assigned).upper():
-                        hw_match = re.search(r'HW\s*(\d+)', str(assigned), re.IGNORECASE)
+                    if assigned:
+                        hw_match = HW_RE.search(str(assigned))
                         if hw_match:
                             homework_numbers.append(int(hw_match.group(1)))
                     
                     # Check due homework
-                    if due and "HW" in str(due).upper():
-                        hw_match = re.search(r'HW\s*(\d+)', str(due), re.IGNORECASE)
+                    if due:
+                        hw_match = HW_RE.search(str(due))
                         if hw_match:
                             homework_numbers.append(int(hw_match.group(1)))
     
@@ -173,32 +189,29 @@ def format_quiz_date_time(quiz_date: str) -> Tuple[str, str]:
     Returns:
         Tuple of (formatted_date_time, day_of_week)
     """
-    from datetime import datetime
-    
-    try:
-        # Parse the date
-        date_obj = datetime.strptime(quiz_date, "%m/%d/%Y")
-        
-        # Format as "Wednesday, January 29th"
-        day_name = date_obj.strftime("%A")
-        month_name = date_obj.strftime("%B")
-        day = date_obj.day
-        
-        # Add ordinal suffix
-        if 10 <= day % 100 <= 20:
-            suffix = "th"
-        else:
-            suffix = {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
-        
-        formatted_date = f"{day_name}, {month_name} {day}{suffix}"
-        
-        return formatted_date, day_name.lower()
-        
-    except ValueError:
+    # Parse the date (cached, the same quiz dates come through for every page)
+    date_obj = parse_schedule_date(quiz_date)
+    if date_obj is None:
         # If parsing fails, return the original date
         return quiz_date, "wednesday"
+    
+    # Format as "Wednesday, January 29th"
+    day_name = date_obj.strftime("%A")
+    month_name = date_obj.strftime("%B")
+    day = date_obj.day
+    
+    # Add ordinal suffix
+    if 10 <= day % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    
+    formatted_date = f"{day_name}, {month_name} {day}{suffix}"
+    
+    return formatted_date, day_name.lower()
 
 
+@cache_folder_id
 def fetch_quizzes_folder_id(course_id: str, access_token: str) -> Optional[str]:
     """
     Fetch the Quizzes folder ID from Canvas course files.
@@ -210,39 +223,7 @@ def fetch_quizzes_folder_id(course_id: str, access_token: str) -> Optional[str]:
     Returns:
         String ID of the Quizzes folder or None if not found
     """
-    headers = {"Authorization": f"Bearer {access_token}"}
-    base_url = "https://umich.instructure.com/api/v1"
-    url = f"{base_url}/courses/{course_id}/folders"
-    
-    try:
-        while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            folders = response.json()
-            
-            # Look for "Quizzes" folder
-            for folder in folders:
-                folder_name = folder.get("name", "")
-                if folder_name.lower() == "quizzes":
-                    return str(folder.get("id"))
-            
-            # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
-                    
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching folders: {e}")
-        return None
-    except Exception as e:
-        print(f"Error processing folders: {e}")
-        return None
-        
-    return None
+    return find_course_folder_id(course_id, access_token, "Quizzes")
 
 
 def fetch_quiz_folder_id(course_id: str, access_token: str, quiz_number: str) -> Optional[str]:
@@ -272,10 +253,7 @@ def fetch_quiz_folder_id(course_id: str, access_token: str, quiz_number: str) ->
     
     try:
         while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            folders = response.json()
+            folders, next_url = get_json_page(url, headers)
             
             # Look for specific quiz folder (e.g., "Quiz 1")
             for folder in folders:
@@ -285,12 +263,7 @@ def fetch_quiz_folder_id(course_id: str, access_token: str, quiz_number: str) ->
                     return str(folder.get("id"))
             
             # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
+            url = next_url
                     
     except requests.exceptions.RequestException as e:
         print(f"Error fetching quiz folders: {e}")
@@ -330,10 +303,7 @@ def fetch_sample_quiz_folder_url(course_id: str, access_token: str, quiz_number:
     
     try:
         while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            folders = response.json()
+            folders, next_url = get_json_page(url, headers)
             
             # Look for the sample subfolder
             for folder in folders:
@@ -346,12 +316,7 @@ def fetch_sample_quiz_folder_url(course_id: str, access_token: str, quiz_number:
                     return folder_url
             
             # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
+            url = next_url
                     
     except requests.exceptions.RequestException as e:
         print(f"Error fetching sample quiz folder: {e}")
@@ -401,10 +366,7 @@ def fetch_all_sample_quiz_folder_urls(course_id: str, access_token: str, max_qui
     
     try:
         while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            folders = response.json()
+            folders, next_url = get_json_page(url, headers)
             
             # Find quiz folders (e.g., "Quiz 1", "Quiz 2")
             for folder in folders:
@@ -417,12 +379,7 @@ def fetch_all_sample_quiz_folder_urls(course_id: str, access_token: str, max_qui
                     print(f"Found quiz folder: {folder_name} (Quiz {quiz_number})")
             
             # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip("<>")
-                    break
+            url = next_url
                     
     except requests.exceptions.RequestException as e:
         print(f"Error fetching quiz folders: {e}")
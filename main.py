@@ -3,7 +3,6 @@ import uuid
 import os
 import glob
 import json
-import pickle
 from fastapi import (
     FastAPI,
     Request,
@@ -17,13 +16,14 @@ from fastapi import (
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import StreamingResponse
-from files.backend.build_htmls.build_weekly_page import build_from_upload
+from files.backend.build_htmls.build_weekly_page import build_from_upload, load_weeks_data
 from files.backend.populate_weeks import populate_weeks
 from files.backend.upload_to_canvas import upload_page
 from files.backend.zip_built_htmls import zip_stream
 from files.backend.build_htmls.build_hw import upload_homework_assignment
 from files.backend.build_htmls.build_quiz import upload_quiz_assignment
 from files.backend.build_htmls.build_checkout import upload_checkout_assignment
+from files.backend.canvas_session import bulk_upload
 from files.backend.populate_weeks_utils import get_week_title_with_topic_and_date
 
 app = FastAPI()
@@ -127,8 +127,7 @@ async def generate(path: str):
         weeks_data = None
         if os.path.exists(weeks_data_file):
             try:
-                with open(weeks_data_file, "rb") as f:
-                    weeks_data = pickle.load(f)
+                weeks_data = load_weeks_data(temp_dir)
             except Exception as e:
                 print(f"Warning: Could not load weeks_data.pkl: {e}")
 
@@ -300,12 +299,12 @@ async def upload_to_canvas(
         weeks_data = None
         if os.path.exists(weeks_data_file):
             try:
-                with open(weeks_data_file, "rb") as f:
-                    weeks_data = pickle.load(f)
+                weeks_data = load_weeks_data(temp_dir)
             except Exception as e:
                 print(f"Warning: Could not load weeks_data.pkl: {e}")
         
         # STEP 1: Upload homework assignments FIRST
+        homework_uploads = []
         for filepath in homework_files:
             try:
                 filename = os.path.basename(filepath)
@@ -322,47 +321,16 @@ async def upload_to_canvas(
                 if due_match:
                     due_date = due_match.group(1)
 
-                result = upload_homework_assignment(
-                    title, html_content, course_id, access_token, due_date
+                homework_uploads.append(
+                    {
+                        "title": title,
+                        "html_content": html_content,
+                        "course_id": course_id,
+                        "access_token": access_token,
+                        "due_date": due_date,
+                    }
                 )
 
-                if result.get("success"):
-                    success_count += 1
-                    assignment_id = result.get("assignment_id")
-                    # Store the homework URL for linking in weekly pages
-                    homework_urls[title] = f"https://umich.instructure.com/courses/{course_id}/assignments/{assignment_id}"
-                    
-                    yield (
-                        "data: "
-                        + json.dumps(
-                            {
-                                "type": "success",
-                                "title": title,
-                                "assignment_id": assignment_id,
-                                "url": result.get("url"),
-                                "current": success_count,
-                                "total": len(html_files),
-                                "item_type": "homework",
-                            }
-                        )
-                        + "\n\n"
-                    )
-                else:
-                    yield (
-                        "data: "
-                        + json.dumps(
-                            {
-                                "type": "error",
-                                "title": title,
-                                "error": result.get("error", "Unknown error"),
-                                "current": success_count,
-                                "total": len(html_files),
-                                "item_type": "homework",
-                            }
-                        )
-                        + "\n\n"
-                    )
-
             except Exception as e:
                 yield (
                     "data: "
@@ -378,8 +346,49 @@ async def upload_to_canvas(
                     )
                     + "\n\n"
                 )
+
+        # the POSTs don't depend on each other, so send them concurrently and report each as it lands
+        for upload, result in bulk_upload(homework_uploads, upload_homework_assignment):
+            title = upload["title"]
+            if result.get("success"):
+                success_count += 1
+                assignment_id = result.get("assignment_id")
+                # Store the homework URL for linking in weekly pages
+                homework_urls[title] = f"https://umich.instructure.com/courses/{course_id}/assignments/{assignment_id}"
+                
+                yield (
+                    "data: "
+                    + json.dumps(
+                        {
+                            "type": "success",
+                            "title": title,
+                            "assignment_id": assignment_id,
+                            "url": result.get("url"),
+                            "current": success_count,
+                            "total": len(html_files),
+                            "item_type": "homework",
+                        }
+                    )
+                    + "\n\n"
+                )
+            else:
+                yield (
+                    "data: "
+                    + json.dumps(
+                        {
+                            "type": "error",
+                            "title": title,
+                            "error": result.get("error", "Unknown error"),
+                            "current": success_count,
+                            "total": len(html_files),
+                            "item_type": "homework",
+                        }
+                    )
+                    + "\n\n"
+                )
         
         # STEP 2: Upload quiz assignments SECOND
+        quiz_uploads = []
         for filepath in quiz_files:
             try:
                 filename = os.path.basename(filepath)
@@ -407,47 +416,16 @@ async def upload_to_canvas(
                     if date_match:
                         quiz_date = date_match.group(1)
 
-                result = upload_quiz_assignment(
-                    title, html_content, course_id, access_token, quiz_date
+                quiz_uploads.append(
+                    {
+                        "title": title,
+                        "html_content": html_content,
+                        "course_id": course_id,
+                        "access_token": access_token,
+                        "quiz_date": quiz_date,
+                    }
                 )
 
-                if result.get("success"):
-                    success_count += 1
-                    assignment_id = result.get("assignment_id")
-                    # Store the quiz URL for linking in weekly pages
-                    quiz_urls[title] = f"https://umich.instructure.com/courses/{course_id}/assignments/{assignment_id}"
-                    
-                    yield (
-                        "data: "
-                        + json.dumps(
-                            {
-                                "type": "success",
-                                "title": title,
-                                "assignment_id": assignment_id,
-                                "url": result.get("url"),
-                                "current": success_count,
-                                "total": len(html_files),
-                                "item_type": "quiz",
-                            }
-                        )
-                        + "\n\n"
-                    )
-                else:
-                    yield (
-                        "data: "
-                        + json.dumps(
-                            {
-                                "type": "error",
-                                "title": title,
-                                "error": result.get("error", "Unknown error"),
-                                "current": success_count,
-                                "total": len(html_files),
-                                "item_type": "quiz",
-                            }
-                        )
-                        + "\n\n"
-                    )
-
             except Exception as e:
                 yield (
                     "data: "
@@ -463,6 +441,46 @@ async def upload_to_canvas(
                     )
                     + "\n\n"
                 )
+
+        # the POSTs don't depend on each other, so send them concurrently and report each as it lands
+        for upload, result in bulk_upload(quiz_uploads, upload_quiz_assignment):
+            title = upload["title"]
+            if result.get("success"):
+                success_count += 1
+                assignment_id = result.get("assignment_id")
+                # Store the quiz URL for linking in weekly pages
+                quiz_urls[title] = f"https://umich.instructure.com/courses/{course_id}/assignments/{assignment_id}"
+                
+                yield (
+                    "data: "
+                    + json.dumps(
+                        {
+                            "type": "success",
+                            "title": title,
+                            "assignment_id": assignment_id,
+                            "url": result.get("url"),
+                            "current": success_count,
+                            "total": len(html_files),
+                            "item_type": "quiz",
+                        }
+                    )
+                    + "\n\n"
+                )
+            else:
+                yield (
+                    "data: "
+                    + json.dumps(
+                        {
+                            "type": "error",
+                            "title": title,
+                            "error": result.get("error", "Unknown error"),
+                            "current": success_count,
+                            "total": len(html_files),
+                            "item_type": "quiz",
+                        }
+                    )
+                    + "\n\n"
+                )
         
         # STEP 3: Upload checkout assignments THIRD (after homework and quiz, since they reference homework)
         # first, regenerate checkout HTML with homework URLs for proper linking
@@ -475,6 +493,7 @@ async def upload_to_canvas(
             except Exception as e:
                 print(f"Warning: Could not regenerate checkout files with homework URLs: {e}")
         
+        checkout_uploads = []
         for filepath in checkout_files:
             try:
                 filename = os.path.basename(filepath)
@@ -491,47 +510,16 @@ async def upload_to_canvas(
                 if due_match:
                     due_date = due_match.group(1)
 
-                result = upload_checkout_assignment(
-                    title, html_content, course_id, access_token, due_date
+                checkout_uploads.append(
+                    {
+                        "title": title,
+                        "html_content": html_content,
+                        "course_id": course_id,
+                        "access_token": access_token,
+                        "due_date": due_date,
+                    }
                 )
 
-                if result.get("success"):
-                    success_count += 1
-                    assignment_id = result.get("assignment_id")
-                    # Store the checkout URL for linking in weekly pages if needed
-                    checkout_urls[title] = f"https://umich.instructure.com/courses/{course_id}/assignments/{assignment_id}"
-                    
-                    yield (
-                        "data: "
-                        + json.dumps(
-                            {
-                                "type": "success",
-                                "title": title,
-                                "assignment_id": assignment_id,
-                                "url": result.get("url"),
-                                "current": success_count,
-                                "total": len(html_files),
-                                "item_type": "checkout",
-                            }
-                        )
-                        + "\n\n"
-                    )
-                else:
-                    yield (
-                        "data: "
-                        + json.dumps(
-                            {
-                                "type": "error",
-                                "title": title,
-                                "error": result.get("error", "Unknown error"),
-                                "current": success_count,
-                                "total": len(html_files),
-                                "item_type": "checkout",
-                            }
-                        )
-                        + "\n\n"
-                    )
-
             except Exception as e:
                 yield (
                     "data: "
@@ -547,6 +535,46 @@ async def upload_to_canvas(
                     )
                     + "\n\n"
                 )
+
+        # the POSTs don't depend on each other, so send them concurrently and report each as it lands
+        for upload, result in bulk_upload(checkout_uploads, upload_checkout_assignment):
+            title = upload["title"]
+            if result.get("success"):
+                success_count += 1
+                assignment_id = result.get("assignment_id")
+                # Store the checkout URL for linking in weekly pages if needed
+                checkout_urls[title] = f"https://umich.instructure.com/courses/{course_id}/assignments/{assignment_id}"
+                
+                yield (
+                    "data: "
+                    + json.dumps(
+                        {
+                            "type": "success",
+                            "title": title,
+                            "assignment_id": assignment_id,
+                            "url": result.get("url"),
+                            "current": success_count,
+                            "total": len(html_files),
+                            "item_type": "checkout",
+                        }
+                    )
+                    + "\n\n"
+                )
+            else:
+                yield (
+                    "data: "
+                    + json.dumps(
+                        {
+                            "type": "error",
+                            "title": title,
+                            "error": result.get("error", "Unknown error"),
+                            "current": success_count,
+                            "total": len(html_files),
+                            "item_type": "checkout",
+                        }
+                    )
+                    + "\n\n"
+                )
         
         # STEP 4: Regenerate weekly pages with homework URLs, quiz URLs, and checkout URLs and upload them
         try: